@@ -7,6 +7,7 @@ import logging
 from typing import Any
 
 import aiohttp
+import orjson
 from yarl import URL
 
 from kyberReserve.endpoints import ReserveEndpoints
@@ -114,7 +115,7 @@ class RequestItem:
             raise Exception("Cannot sign request without a SECRET or KEY-ID.")
         self._add_sign_specific_headers()
         msg = self._get_string_to_sign()
-        raw_sig = hmac.new(self.secret, msg, hashlib.sha512).digest()
+        raw_sig = hmac.digest(self.secret, msg, "sha512")
         sig = base64.b64encode(raw_sig).decode()
         sig_struct = [
             ("keyId", self.key_id),
@@ -130,11 +131,21 @@ class RequestItem:
         self._signed = False
 
 
-async def fetch_url(request: RequestItem, timeout: int = 60) -> dict:
+def _session_timeout(timeout: int) -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+
+
+async def fetch_url(
+    request: RequestItem,
+    timeout: int = 60,
+    session: aiohttp.ClientSession | None = None,
+) -> dict:
     """Asynchronously fetches a request.
 
     Args:
         request: The `RequestItem` to fetch.
+        session: Optional session to reuse its connection pool. If None, a new
+            session is opened for this request only.
 
     Returns:
         A response json object.
@@ -144,36 +155,51 @@ async def fetch_url(request: RequestItem, timeout: int = 60) -> dict:
         request.sign()
     lgr.debug(f"fetch_url - Fetching: {url}")
     try:
-        session_timeout = aiohttp.ClientTimeout(
-            total=None, sock_connect=timeout, sock_read=timeout
-        )
-        async with aiohttp.ClientSession(
-            headers=request.headers, timeout=session_timeout
-        ) as session:
-            async with session.get(url, allow_redirects=True, timeout=timeout) as resp:
-                resp.raise_for_status()
-                return {"success": await resp.json()}
+        if session is None:
+            async with aiohttp.ClientSession(
+                headers=request.headers, timeout=_session_timeout(timeout)
+            ) as session:
+                async with session.get(
+                    url, allow_redirects=True, timeout=timeout
+                ) as resp:
+                    resp.raise_for_status()
+                    return {"success": await resp.json(loads=orjson.loads)}
+        async with session.get(
+            url, headers=request.headers, allow_redirects=True, timeout=timeout
+        ) as resp:
+            resp.raise_for_status()
+            return {"success": await resp.json(loads=orjson.loads)}
     except (asyncio.exceptions.TimeoutError, aiohttp.ClientResponseError) as err:
         lgr.error(f"Error fetching {url}: {err}")
         return {"failed": str(err)}
 
 
-async def fetch_all_urls(reqs: list[RequestItem]) -> list[dict]:
+async def fetch_all_urls(
+    reqs: list[RequestItem], max_concurrent: int | None = None, timeout: int = 60
+) -> list[dict]:
     """Asynchronously fetches all requests in a list.
 
     Args:
         reqs: A list of URLs to fetch.
+        max_concurrent: If set, all requests share a single session and at most
+            `max_concurrent` of them are in flight at any time.
 
     Returns:
-        A list of response objects.
+        A list of response objects, in the order of `reqs`.
     """
+    if not max_concurrent:
+        tasks = [asyncio.create_task(fetch_url(req, timeout)) for req in reqs]
+        responses = await asyncio.gather(*tasks)
+        return responses
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+    async with aiohttp.ClientSession(timeout=_session_timeout(timeout)) as session:
 
-    tasks = []
-    for req in reqs:
-        tasks.append(asyncio.create_task(fetch_url(req)))
+        async def bounded_fetch(req: RequestItem) -> dict:
+            async with semaphore:
+                return await fetch_url(req, timeout, session)
 
-    responses = await asyncio.gather(*tasks)
-    return responses
+        return await asyncio.gather(*(bounded_fetch(req) for req in reqs))
 
 
 class ContextSignedRequest:
@@ -194,17 +220,24 @@ class ContextSignedRequest:
         self.auth_ctx = authContext
         self.host, self.key_id, self.secret = self.auth_data.get_ctx(self.auth_ctx)
         self.endpoints = ReserveEndpoints(endpoints_json).endpoints
+        # mark-to-market lives on its own host, resolve it once if configured
+        if "mark-to-market_rate" in self.endpoints:
+            self._mtm_host = self.endpoints["mark-to-market_rate"].host_base
+            self._mtm_path = self.endpoints["mark-to-market_rate"].path
+            self._mtm_hist_path = self.endpoints["mark-to-market_historical/rate"].path
         lgr.info(f"ReserveClient initialized with auth context: {self.auth_ctx}")
 
     def get(
         self,
         endpoint: str,
         params: Any | None = None,
+        host: str | None = None,
     ) -> RequestItem:
-        """Convenience function to create a `RequestItem` for GET requests."""
+        """Convenience function to create a `RequestItem` for GET requests. `host`
+        defaults to the context host."""
         return RequestItem(
             method="GET",
-            url=f"{self.host}/{endpoint}",
+            url=f"{host or self.host}/{endpoint}",
             headers=None,
             signed_fields=None,
             body=None,
@@ -255,33 +288,28 @@ class ContextSignedRequest:
         # make array of params combining base and quote lists
         pairs = [(i, j) for i in base for j in quote if i != j]
         params: list[dict[str, Any]] = [dict(base=b, quote=q) for b, q in pairs]
-        temp_host = self.host
-        self.host = self.endpoints["mark-to-market_rate"].host_base
-        endpoint = (
-            self.endpoints["mark-to-market_rate"].path
-            if ts_sec is None
-            else self.endpoints["mark-to-market_historical/rate"].path
-        )
+        host = self._mtm_host
+        endpoint = self._mtm_path if ts_sec is None else self._mtm_hist_path
         reqs = []
         mtm = []
         for idx, p in enumerate(params):
             if ts_sec is None:
-                reqs.append(self.get(endpoint, p))
+                reqs.append(self.get(endpoint, p, host))
                 mtm.append(p | {"time": None})
             else:
                 if isinstance(ts_sec, int):
                     p["time"] = ts_sec
-                    reqs.append(self.get(endpoint, p))
+                    reqs.append(self.get(endpoint, p, host))
                     mtm.append(p)
                 else:
                     if ts_unique:
                         p["time"] = ts_sec[idx]
-                        reqs.append(self.get(endpoint, p))
+                        reqs.append(self.get(endpoint, p, host))
                         mtm.append(p.copy())
                     else:
                         for ts in ts_sec:
                             p["time"] = ts
-                            reqs.append(self.get(endpoint, p))
+                            reqs.append(self.get(endpoint, p, host))
                             mtm.append(p.copy())
         # if len(reqs) > 10, then send in batches of 10
         if (n_reqs := len(reqs)) > 10:
@@ -293,9 +321,8 @@ class ContextSignedRequest:
                 responses += await fetch_all_urls(reqs[i:end])
         else:
             responses = await fetch_all_urls(reqs)
-        self.host = temp_host
         for i, resp in enumerate(responses):
-            if "success" in resp.keys() and "success" in resp["success"].keys():
+            if "success" in resp and "success" in resp["success"]:
                 try:
                     mtm[i]["rate"] = resp["success"]["data"]["rate"]
                 except KeyError:
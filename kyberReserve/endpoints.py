@@ -1,6 +1,7 @@
 import json
 from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urlencode
 
 
 @dataclass
@@ -21,7 +22,7 @@ class EndpointItem:
         else:
             path = f"{self.base}/{self.path}"
         if options:
-            path += "?" + "&".join([f"{k}={v}" for k, v in options.items()])
+            path += "?" + urlencode(sorted(options.items()), doseq=True)
         if path.startswith("/"):
             path = path[1:]
         return path
@@ -59,6 +59,12 @@ class EtherScanClient:
     def __init__(self, api_key: str) -> None:
         self.api_key = api_key
         self.base_url = "https://api.etherscan.io/api"
+        # reuse the connection to etherscan across calls, paginated ones included
+        self._session = requests.Session()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
 
     def _make_url(self, module: str, action: str, **params) -> str:
         q_params = {"module": module, "action": action, "apikey": self.api_key} | params
@@ -67,13 +73,13 @@ class EtherScanClient:
     def get_acc_balance(self, address: str) -> dict:
         """The result is returned in wei. To convert to ETH, divide by 1e18"""
         url = self._make_url("account", "balance", address=address, tag="latest")
-        response = requests.get(url)
+        response = self._session.get(url)
         return response.json()
 
     def latest_block_num(self) -> str | None:
         """Returns the number of most recent block"""
         url = self._make_url("proxy", "eth_blockNumber")
-        self._resp = requests.get(url)
+        self._resp = self._session.get(url)
         return self._parse_resp()
 
     def _block_resp_asObj(self) -> Block | None:
@@ -92,7 +98,7 @@ class EtherScanClient:
         url = self._make_url(
             "proxy", "eth_getBlockByNumber", tag=block_num, boolean=info
         )
-        self._resp = requests.get(url)
+        self._resp = self._session.get(url)
         if as_object:
             return self._block_resp_asObj()
         return self._parse_resp()
@@ -111,7 +117,7 @@ class EtherScanClient:
         if not ts:
             return self.get_block(info=info, as_object=as_object)
         url = self._make_url("block", "getblocknobytime", timestamp=ts, closest=closest)
-        self._resp = requests.get(url)
+        self._resp = self._session.get(url)
         res = self._parse_resp()
         if res:
             return self.get_block(int(res), info, as_object=as_object)
@@ -210,7 +216,7 @@ class EtherScanClient:
         """Get the transaction receipt. Usefull to get the status of the transaction
         and gas used."""
         url = self._make_url("proxy", "eth_getTransactionReceipt", txhash=txn_hash)
-        self._resp = requests.get(url)
+        self._resp = self._session.get(url)
         return self._parse_resp()
 
     def get_logs(
@@ -266,7 +272,7 @@ class EtherScanClient:
             all_txs = []
             while True:
                 url = self._make_url(module, action, **params)
-                self._resp = requests.get(url)
+                self._resp = self._session.get(url)
                 if data := self._parse_resp():
                     all_txs.extend(data)
                     if len(data) < params["offset"]:
@@ -280,7 +286,7 @@ class EtherScanClient:
             return all_txs
         else:
             url = self._make_url(module, action, **params)
-            self._resp = requests.get(url)
+            self._resp = self._session.get(url)
             if data := self._parse_resp():
                 return data
         return []
@@ -335,9 +341,9 @@ class EtherScanClient:
             max_lookup_addresses (int): Max number of addresses to fetch
             levels (int): Number of levels to search
             compare_to_banned (list[str]): List of banned addresses to compare against
-            results_file (str): File to save the results. Example:
+            results_file (str): JSON Lines file to append the results to. Example:
                 f_suffix = datetime.utcnow().strftime("%H%M%ST%d%m%y")
-                results_file = f"./data/anal_bin_compare_{f_suffix}.json"
+                results_file = f"./data/anal_bin_compare_{f_suffix}.jsonl"
             save_every_n (int): Save every n results
         Returns:
             tuple[set[str], set[str]]: Tuple of related addresses and potential banned
@@ -377,7 +383,9 @@ class EtherScanClient:
                         f"address(es): {found_banned}"
                     )
             results += list(dif_addrs)
-            if saveEveryNth(results, results_file, save_every_n):
+            if len(results) >= save_every_n and saveEveryNth(
+                results, results_file, save_every_n
+            ):
                 results = []
             print(f"Currently found linked addresses are {len(visited_addresses)}")
 
@@ -1,19 +1,30 @@
-import base64
+import asyncio
 import hashlib
 import hmac
 import logging
+import os
+import tempfile
 import urllib.parse
+from binascii import b2a_base64
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from functools import wraps
-from time import time
+from functools import lru_cache, wraps
+from time import monotonic, perf_counter_ns, time
 from timeit import default_timer as timer
 from typing import Any, Callable
 
+import numpy as np
+import orjson
 import requests.models
 from requests import PreparedRequest, Request, Response
+from requests.adapters import HTTPAdapter
+from requests.models import RequestEncodingMixin
+from urllib3.util.retry import Retry
 
+from kyberReserve.asyncReserveTools import RequestItem, fetch_all_urls
 from kyberReserve.endpoints import ReserveEndpoints
-from kyberReserve.tokens import kn_traded_full
+from kyberReserve.tokens import TOKEN_BY_NAME
 from kyberReserve.utils import (
     AuthContext,
     AuthenticationData,
@@ -33,27 +44,73 @@ def response_stats(func) -> Callable:
 
     @wraps(func)
     def wrapper(*args, **kwargs) -> dict[str, Any]:
-        start = timer()
+        start = perf_counter_ns()
         resp = func(*args, **kwargs)
-        end = timer()
-        stats = {"roundtrip": f"{end - start}", "local_time": time()}
-        if isinstance(resp, dict) and "success" in resp and (r := resp["success"]):
-            if isinstance(r, Response):
-                stats.update(
-                    {
-                        "elapsed": f"{r.elapsed}",
-                        "srv_time": r.headers.get("Date", "-"),
-                    }
-                )
+        stats = {"roundtrip_ns": perf_counter_ns() - start, "local_time": time()}
+        if (r := resp.get("success")).__class__ is Response:
+            stats["elapsed"] = r.elapsed.total_seconds()
+            stats["srv_time"] = r.headers.get("Date", "-")
         resp["stats"] = stats
         return resp
 
     return wrapper
 
 
+_MTM_ALIASES = {"WETH": "ETH"}  # symbols mark-to-market knows by another name
+
+_DEFAULT_SIGNED_HEADERS = ["(request-target)", "nonce", "digest"]
+
+
+def _path_url(url: str) -> str:
+    """Path and query of `url`, as `requests` builds `PreparedRequest.path_url`."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+@lru_cache(maxsize=256)
+def _encode_csv(values: tuple[str, ...]) -> str:
+    """Comma join query values, cached as pollers repeat the same lists."""
+    return ",".join(values)
+
+
+def _walk_levels(
+    levels: np.ndarray, in_decimals: int, amounts_in: np.ndarray
+) -> np.ndarray:
+    """Average price for each of `amounts_in` when walking 0x `levels`.
+
+    Args:
+        levels: (N, 2) array of [cumulative in amount, price] pairs, in raw units.
+        in_decimals: decimals of the input token.
+        amounts_in: input amounts, in token units.
+
+    Returns:
+        Array of prices, 0 where the levels cannot fill the amount.
+    """
+    prices = np.zeros(amounts_in.shape)
+    if not levels.shape[0]:
+        return prices
+    total_in = levels[:, 0] / 10**in_decimals
+    level_prices = levels[:, 1] / 10**18
+    total_out = np.cumsum(np.diff(total_in, prepend=0.0) * level_prices)
+    # first level that covers more than each amount, clipped to the last one
+    idx = np.searchsorted(total_in, amounts_in, side="right")
+    last = np.minimum(idx, levels.shape[0] - 1)
+    excess_in = np.where(idx < levels.shape[0], total_in[last] - amounts_in, 0.0)
+    filled = (amounts_in > 0) & (total_in[-1] >= amounts_in)
+    out_amounts = total_out[last] - excess_in * level_prices[last]
+    np.divide(out_amounts, amounts_in, out=prices, where=filled)
+    return prices
+
+
 class ReserveClient:
     """Kyber Reserve API client."""
 
+    banned_cache_ttl: float = 60.0  # seconds to reuse the fetched 0x blacklist
+    asset_cache_ttl: float = 300.0  # seconds to reuse asset info cached on disk, 0 off
+    tradelogs_window_ms: int = 86_400_000  # server limit for a tradelogs request
+    max_workers: int = 8  # concurrent windows for time ranged downloads
+
     def __init__(
         self,
         key_file: str,
@@ -70,10 +127,43 @@ class ReserveClient:
         """
         self.auth_data = AuthenticationData(key_file)
         self.auth_ctx = authContext
-        self.host, self.key_id, self.secret = self.auth_data.get_ctx(self.auth_ctx)
+        host, self.key_id, self.secret = self.auth_data.get_ctx(self.auth_ctx)
+        # static part of the Signature header for the default signed headers
+        self._sig_prefix = (
+            f'keyId="{self.key_id}",algorithm="hmac-sha512",'
+            f'headers="{" ".join(_DEFAULT_SIGNED_HEADERS)}",signature="'
+        )
         self.endpoints = ReserveEndpoints(endpoints_json).endpoints
+        # endpoints are static, resolve their paths and urls once
+        self._urls = {name: ep.full_path() for name, ep in self.endpoints.items()}
+        self._full_urls = {name: ep.full_url() for name, ep in self.endpoints.items()}
+        self._secured = {name: ep.secured for name, ep in self.endpoints.items()}
+        self._mtm_url = self._full_urls.get("mark-to-market_rate", "")
+        self._mtm_hist_url = self._full_urls.get("mark-to-market_historical/rate", "")
+        self.host = host
         lgr.info(f"ReserveClient initialized with auth context: {self.auth_ctx}")
         self.timeout = timeout
+        # extra headers sent with 0x/quote requests, by `integration` param
+        self._integration_headers = {"paraswap": {"api-key": "API-KEY"}}
+        if self.auth_data.api_key_0x is not None:
+            self._integration_headers["0x"] = {"0x-api-key": self.auth_data.api_key_0x}
+        self._banned_cache: tuple[float, tuple[str, ...]] | None = None
+        # one session for the client lifetime, keeps connections to hosts alive
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                # writes are not idempotent, a POST is never resent
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         (
             self.tokens,
             self.exchanges,
@@ -81,6 +171,26 @@ class ReserveClient:
             self.tokens_decimals,
         ) = self.get_tokens_exchanges_from_asset_info(incl_disabled=incl_disabled)
 
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @host.setter
+    def host(self, value: str) -> None:
+        self._host = value
+        # absolute urls on the reserve host, keyed by endpoint path
+        self._host_urls = {path: f"{value}/{path}" for path in self._urls.values()}
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "ReserveClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
     def get_assetID(self, asset: str) -> int:
         return self.tokens.get(asset, 0)
 
@@ -90,28 +200,41 @@ class ReserveClient:
     def sign(
         self,
         request: PreparedRequest,
-        headers: list[str] = ["(request-target)", "nonce", "digest"],
+        headers: list[str] = _DEFAULT_SIGNED_HEADERS,
+        path_url: str | None = None,
     ) -> PreparedRequest:
+        """Sign `request` in place. `path_url` is the request path and query, if
+        the caller already has it, otherwise it is derived from the request url."""
         self._add_date(request)
         if "digest" in headers:
             self._add_digest(request)
-        msg = self._get_string_to_sign(request, headers)
-        raw_sig = hmac.new(self.secret, msg, hashlib.sha512).digest()
-        sig = base64.b64encode(raw_sig).decode()
+        if path_url is None:
+            path_url = _path_url(request.url)
+        msg = self._get_string_to_sign(request, headers, path_url)
+        request.headers["Signature"] = self._signature(msg, headers)
+        return request
+
+    def _signature(self, msg: bytes, headers: list[str]) -> str:
+        """Build the `Signature` header value for the signed string `msg`."""
+        raw_sig = hmac.digest(self.secret, msg, "sha512")
+        sig = b2a_base64(raw_sig, newline=False).decode("ascii")
+        if headers == _DEFAULT_SIGNED_HEADERS:
+            return f'{self._sig_prefix}{sig}"'
         sig_struct = [
             ("keyId", self.key_id),
             ("algorithm", "hmac-sha512"),
             ("headers", " ".join(headers)),
             ("signature", sig),
         ]
-        request.headers["Signature"] = ",".join(f'{k}="{v}"' for k, v in sig_struct)
-        return request
+        return ",".join(f'{k}="{v}"' for k, v in sig_struct)
 
     @staticmethod
     def _add_digest(request: PreparedRequest) -> None:
         if request.body is not None and "Digest" not in request.headers:
             digest = hashlib.sha256(request.body).digest()  # pyre-ignore
-            request.headers["Digest"] = "SHA-256=" + base64.b64encode(digest).decode()
+            request.headers["Digest"] = "SHA-256=" + b2a_base64(
+                digest, newline=False
+            ).decode("ascii")
 
     @staticmethod
     def _add_date(request: PreparedRequest) -> None:
@@ -119,11 +242,21 @@ class ReserveClient:
             request.headers["nonce"] = ts_millis()
 
     @staticmethod
-    def _get_string_to_sign(request: PreparedRequest, headers: list[str]) -> bytes:
+    def _get_string_to_sign(
+        request: PreparedRequest, headers: list[str], path_url: str | None = None
+    ) -> bytes:
+        if path_url is None:
+            path_url = _path_url(request.url)
+        if headers == _DEFAULT_SIGNED_HEADERS:
+            # almost all requests sign the default set, build it without looping
+            return (
+                f"(request-target): {request.method.lower()} {path_url}\n"
+                f"nonce: {request.headers.get('nonce', '')}\n"
+                f"digest: {request.headers.get('digest', '')}"
+            ).encode()
         sts = []
         for header in headers:
             if header == "(request-target)":
-                path_url = requests.models.RequestEncodingMixin.path_url.fget(request)
                 sts.append(f"(request-target): {request.method.lower()} {path_url}")
             else:
                 if header.lower() == "host":
@@ -147,28 +280,60 @@ class ReserveClient:
     ) -> Response:
         custom_headers = {}
         if params and isinstance(params, dict) and "integration" in params:
+            integration = params["integration"]
+            # leave the caller's dict intact, it may be reused for the next request
+            params = {k: v for k, v in params.items() if k != "integration"}
             if "0x/quote" in url:
-                if params["integration"] == "0x":
-                    custom_headers["0x-api-key"] = self.auth_data.data["0x-api-key"]
-                elif params["integration"] == "paraswap":
-                    custom_headers["api-key"] = "API-KEY"
-            params.pop("integration")
-
+                custom_headers = self._integration_headers.get(integration, {})
+
+        if (
+            secured
+            and method == "GET"
+            and data is None
+            and json is None
+            and (params is None or isinstance(params, dict))
+        ):
+            return self._get_signed(url, params, custom_headers, timeout)
         req = Request(method, url, data=data, params=params, json=json)
-        with requests.sessions.Session() as session:
-            prep = session.prepare_request(req)
-            if secured:
-                sreq = self.sign(prep)
-                for key, value in custom_headers.items():
-                    sreq.headers[key] = value
-            else:
-                sreq = prep
-            # Send the request.
-            send_kwargs = {
-                "timeout": timeout,
-                "allow_redirects": True,
-            }
-            return session.send(sreq, **send_kwargs)
+        prep = self._session.prepare_request(req)
+        if secured:
+            sreq = self.sign(prep)
+            for key, value in custom_headers.items():
+                sreq.headers[key] = value
+        else:
+            sreq = prep
+        # Send the request.
+        send_kwargs = {
+            "timeout": timeout,
+            "allow_redirects": True,
+        }
+        return self._session.send(sreq, **send_kwargs)
+
+    def _get_signed(
+        self,
+        url: str,
+        params: dict | None,
+        custom_headers: dict[str, str],
+        timeout: int | None,
+    ) -> Response:
+        """Signed GET without a body. The query is encoded once, the same way
+        `requests` does, and the default headers are signed directly from it."""
+        query = RequestEncodingMixin._encode_params(params) if params else ""
+        if query:
+            # extend a query already in the url, as `requests` does
+            sep = "&" if urllib.parse.urlsplit(url).query else "?"
+            url = f"{url}{sep}{query}"
+        path_url = _path_url(url)
+        nonce = str(ts_millis())
+        msg = f"(request-target): get {path_url}\nnonce: {nonce}\ndigest: ".encode()
+        headers = {
+            "nonce": nonce,
+            "Signature": self._signature(msg, _DEFAULT_SIGNED_HEADERS),
+        }
+        headers.update(custom_headers)
+        return self._session.get(
+            url, headers=headers, timeout=timeout, allow_redirects=True
+        )
 
     def request(
         self,
@@ -182,7 +347,7 @@ class ReserveClient:
         try:
             resp = self._request(
                 method=method,
-                url=f"{self.host}/{endpoint}",
+                url=self._host_urls.get(endpoint) or f"{self.host}/{endpoint}",
                 data=data,
                 params=params,
                 json=json,
@@ -190,7 +355,7 @@ class ReserveClient:
                 secured=True,
             )
             if resp.status_code == 200:
-                resp_data = resp.json()
+                resp_data = orjson.loads(resp.content)
                 return {"success": resp_data}
             else:
                 reason = (
@@ -198,7 +363,7 @@ class ReserveClient:
                     f" to {endpoint}, params:{params}, data: {data}, json: {json}"
                 )
                 return {"failed": reason}
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             reason = f"Cannot make request to host: {endpoint} {e.__repr__()}"
             return {"failed": reason}
 
@@ -250,7 +415,7 @@ class ReserveClient:
         return {"success": resp}
 
     def get_authdata(self) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["v3_authdata"].full_path())
+        return self.requestGET(self._urls["v3_authdata"])
 
     def get_balances(self) -> dict[str, Any]:
         resp = self.get_authdata()
@@ -275,25 +440,21 @@ class ReserveClient:
         self, asset_type: str = "all", incl_disabled: bool = True
     ) -> dict[str, Any]:
         params = {"asset_type": asset_type, "include_disabled": incl_disabled}
-        return self.requestGET(self.endpoints["v3_asset"].full_path(), params=params)
+        return self.requestGET(self._urls["v3_asset"], params=params)
 
     def get_0x_rate(self, params: dict) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["0x_quote"].full_path(), params=params)
+        return self.requestGET(self._urls["0x_quote"], params=params)
 
     def get_0x_rate_check_nr(self, params: dict) -> dict[str, Any]:
         for i in range(2):
             if i == 1:
                 params["nr"] = True
-            resp = self.requestGET(
-                self.endpoints["0x_price"].full_path(), params=params
-            )
+            resp = self.requestGET(self._urls["0x_price"], params=params)
         return resp
 
     def get_pricing_details(self, params: dict | None = None) -> dict[str, Any]:
         """Get pricing details for reserve. Previously known as `get_analytic_rate`."""
-        return self.requestGET(
-            self.endpoints["0x_current-pricing"].full_path(), params=params
-        )
+        return self.requestGET(self._urls["0x_current-pricing"], params=params)
 
     def get_asset_pricing(
         self, assetID: int, all_rates: dict[str, Any] | None = None
@@ -315,51 +476,83 @@ class ReserveClient:
         return asset_rate
 
     def get_0x_levels(self, params: dict | None = None) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["0x_levels"].full_path(), params=params)
+        return self.requestGET(self._urls["0x_levels"], params=params)
 
     def get_0x_mid_prices(self, params: dict) -> dict[str, Any]:
-        return self.requestGET(
-            self.endpoints["0x_mid-prices"].full_path(), params=params
-        )
+        return self.requestGET(self._urls["0x_mid-prices"], params=params)
 
     def get_addresses(self) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["v3_addresses"].full_path())
+        return self.requestGET(self._urls["v3_addresses"])
 
     def get_current_rfq_pricing(self, params: dict | None = None) -> dict[str, Any]:
-        return self.requestGET(
-            self.endpoints["rfq_current-base-pricing"].full_path(), params=params
-        )
+        return self.requestGET(self._urls["rfq_current-base-pricing"], params=params)
+
+    def _asset_cache_path(self, incl_disabled: bool) -> str:
+        cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        key = hashlib.sha256(f"{self.host}|{incl_disabled}".encode()).hexdigest()
+        return os.path.join(cache_dir, "kn-reserve-mgr", f"assets-{key[:16]}.json")
+
+    def _cached_asset_info(self, incl_disabled: bool) -> dict[str, Any]:
+        """`get_asset_info`, served from the on-disk cache while it is younger than
+        `asset_cache_ttl` seconds. Successful replies are written back to it."""
+        path = self._asset_cache_path(incl_disabled)
+        if self.asset_cache_ttl > 0:
+            try:
+                if time() - os.path.getmtime(path) < self.asset_cache_ttl:
+                    with open(path, "rb") as fh:
+                        return {"success": orjson.loads(fh.read())}
+            except (OSError, orjson.JSONDecodeError):
+                pass
+        resp = self.get_asset_info(incl_disabled=incl_disabled)
+        if self.asset_cache_ttl > 0 and (assets := resp.get("success")):
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    dir=os.path.dirname(path), delete=False
+                ) as fh:
+                    fh.write(orjson.dumps(assets))
+                os.replace(fh.name, path)
+            except OSError as e:
+                lgr.warning("Cannot cache asset info to %s: %s", path, e)
+        return resp
+
+    def invalidate_asset_cache(self) -> None:
+        """Remove the on-disk asset info cache of this host."""
+        for incl_disabled in (True, False):
+            try:
+                os.remove(self._asset_cache_path(incl_disabled))
+            except FileNotFoundError:
+                pass
 
     def get_tokens_exchanges_from_asset_info(
         self, incl_disabled: bool = True, incl_WETH: bool = True
     ) -> tuple[dict, dict, dict, dict]:
-        resp = self.get_asset_info(incl_disabled=incl_disabled)
+        resp = self._cached_asset_info(incl_disabled)
         assets = resp.get("success")
         if not assets:
             raise BaseException(f"cannot get asset info {resp}")
         tokens = {}
-        exchanges = {}
+        exchanges: dict[int, dict] = {}
         tokens_addr = {}
         tokens_decimals = {}
-        # print(assets)
+        pairs = []  # (exchange_id, pair_id, base_id, quote_id)
         for i in assets["data"]:
-            if i["symbol"] not in tokens:
-                tokens[i["symbol"]] = i["id"]
-                tokens[i["id"]] = i["symbol"]
-                tokens_addr[i["symbol"]] = i["address"]
-                tokens_addr[i["address"]] = i["symbol"]
-                tokens_decimals[i["symbol"]] = i["decimals"]
-                tokens_decimals[i["address"]] = i["decimals"]
-                if "exchanges" in i:
-                    for _ in i["exchanges"]:
-                        if _["exchange_id"] not in exchanges:
-                            exchanges[_["exchange_id"]] = {}
-                        if "trading_pairs" in _:
-                            for pair in _["trading_pairs"]:
-                                exchanges[_["exchange_id"]][pair["id"]] = [
-                                    pair["base"],
-                                    pair["quote"],
-                                ]
+            symbol = i["symbol"]
+            if symbol in tokens:
+                continue
+            address = i["address"]
+            tokens[symbol] = i["id"]
+            tokens[i["id"]] = symbol
+            tokens_addr[symbol] = address
+            tokens_addr[address] = symbol
+            tokens_decimals[symbol] = tokens_decimals[address] = i["decimals"]
+            for ex in i.get("exchanges", ()):
+                ex_id = ex["exchange_id"]
+                exchanges.setdefault(ex_id, {})
+                pairs.extend(
+                    (ex_id, pair["id"], pair["base"], pair["quote"])
+                    for pair in ex.get("trading_pairs", ())
+                )
         if incl_WETH:
             weth = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2".lower()
             tokens["WETH"] = weth
@@ -369,15 +562,10 @@ class ReserveClient:
             tokens_addr[weth] = "WETH"
             tokens_addr["WETH"] = weth
 
-        for e in exchanges:
-            new_pairs = {}
-            for pair in exchanges[e]:
-                p = f"{tokens[exchanges[e][pair][0]]}{tokens[exchanges[e][pair][1]]}"
-                new_pairs[p] = exchanges[e][pair]
-                # print(p)
-                exchanges[e][pair].append(p)
-            for np in new_pairs:
-                exchanges[e][np] = new_pairs[np]
+        # pairs are indexed both by id and by name, eg. "KNCETH"
+        for ex_id, pair_id, base, quote in pairs:
+            name = f"{tokens[base]}{tokens[quote]}"
+            exchanges[ex_id][pair_id] = exchanges[ex_id][name] = (base, quote, name)
         return tokens, exchanges, tokens_addr, tokens_decimals
 
     def get_RFQ_params(self, incl_disabled: bool = True) -> dict[str, Any]:
@@ -424,19 +612,13 @@ class ReserveClient:
         side="sell",
         fake_ib=True,
     ) -> dict[str, Any]:
-        token_in_addr, token_out_addr = None, None
-        for i in kn_traded_full:
-            if i.name.upper() == token_in.upper():
-                token_in_addr = i.addresses[-1]
-                decimals_in = i.decimals
-            if i.name.upper() == token_out.upper():
-                token_out_addr = i.addresses[-1]
-                decimals_out = i.decimals
-            if isinstance(token_in_addr, str) and isinstance(token_out_addr, str):
-                break
-        if not (isinstance(token_in_addr, str) and isinstance(token_out_addr, str)):
-            print(f"can't find token addresses for {token_in} and {token_out}")
+        t_in = TOKEN_BY_NAME.get(token_in.upper())
+        t_out = TOKEN_BY_NAME.get(token_out.upper())
+        if t_in is None or t_out is None:
+            lgr.warning("Can't find token addresses for %s and %s", token_in, token_out)
             return {"failed": "can't find token addresses"}
+        token_in_addr, decimals_in = t_in.addresses[-1], t_in.decimals
+        token_out_addr, decimals_out = t_out.addresses[-1], t_out.decimals
 
         params_add = {}
         if integration == "paraswap":
@@ -498,23 +680,16 @@ class ReserveClient:
         return token_out_amount / token_in_amount
 
     def get_0x_price_two_sided(self, token: str, eth_amount: float, integration="0x"):
-        t_address, w_address = None, None
-        for t in kn_traded_full:
-            if t.name.upper() == token:
-                t_address = t.addresses[-1]
-                t_decimals = t.decimals
-            if t.name.upper() == "WETH":
-                w_address = t.addresses[-1]
-                w_decimals = t.decimals
-        if not isinstance(t_address, str) or not isinstance(w_address, str):
-            print(f"can't get two sides rate for {token}")
+        t_token, w_token = TOKEN_BY_NAME.get(token), TOKEN_BY_NAME.get("WETH")
+        if t_token is None or w_token is None:
+            lgr.warning("Can't get two sides rate for %s", token)
             return
+        t_decimals, w_decimals = t_token.decimals, w_token.decimals
         # buy rate
         resp = self.get_0x_price("WETH", token, eth_amount, integration=integration)
         if not (b_r := resp.get("success")):
-            print(f"missing buy rate")
+            lgr.warning("Missing buy rate for %s", token)
             return
-        # print(b_r)
         buy_amount = (
             int(b_r["makerAmount"])
             if "makerAmount" in b_r
@@ -523,35 +698,32 @@ class ReserveClient:
         # sell rate
         resp = self.get_0x_price(token, "WETH", buy_amount / 10**t_decimals)
         if not (s_r := resp.get("success")):
-            print(f"missing sell rate")
+            lgr.warning("Missing sell rate for %s", token)
             return
-        # print(s_r)
 
         sell_amount = (
             int(s_r["makerAmount"])
             if "makerAmount" in s_r
             else int(s_r["signedOrder"]["makerAmount"])
         )
-        print(f"buy_amount:{buy_amount} sell_amount:{sell_amount}")
-        side1_rate = convert_rate_to_binance(
-            eth_amount, buy_amount / 10**t_decimals, "ETH", token
-        )[2]
-        side2_rate = convert_rate_to_binance(
-            buy_amount / 10**t_decimals, sell_amount / 10**w_decimals, token, "ETH"
-        )[2]
-        side1_side = convert_rate_to_binance(
-            eth_amount, buy_amount / 10**t_decimals, "ETH", token
-        )[1]
-        side2_side = convert_rate_to_binance(
-            buy_amount / 10**t_decimals, sell_amount / 10**w_decimals, token, "ETH"
-        )[1]
+        lgr.debug("buy_amount: %s, sell_amount: %s", buy_amount, sell_amount)
+        token_amount = buy_amount / 10**t_decimals
+        side1 = convert_rate_to_binance(eth_amount, token_amount, "ETH", token)
+        side2 = convert_rate_to_binance(
+            token_amount, sell_amount / 10**w_decimals, token, "ETH"
+        )
+        if side1 is None or side2 is None:
+            lgr.warning("Cannot convert two sided rate for %s", token)
+            return
+        side1_side, side1_rate = side1[1], side1[2]
+        side2_side, side2_rate = side2[1], side2[2]
         if side1_side.lower() == "ask" and side2_side.lower() == "bid":
             ask, bid = side1_rate, side2_rate
         elif side2_side.lower() == "ask" and side1_side.lower() == "bid":
             ask, bid = side2_rate, side1_rate
         else:
             ask, bid = 0, 0
-            print("cannot convert")
+            lgr.warning("Cannot convert two sided rate for %s", token)
             return
         print(
             f"{self.auth_ctx}:{integration}\nask:{ask}\nbid:{bid}\nspread percent is "
@@ -559,194 +731,175 @@ class ReserveClient:
         )
 
     def get_rate_trigger(
-        self, from_time=ts_millis() - 3600 * 1000, to_time=ts_millis()
+        self, from_time: int | None = None, to_time: int | None = None
     ):
-        endpoint = self.endpoints["v3_token-rate-trigger"].full_path()
-        past_triggers = {}
-        while from_time < to_time:
-            params = {
-                "fromTime": from_time,
-                "toTime": min(from_time + 86399999, to_time),
-            }
-            print(f"getting triggers from:{from_time} to:{to_time}")
-            from_time += 86400000
-            x = 0
-            while x < 3:
-                x += 1
-                try:
-                    resp = self.requestGET(endpoint, params=params)
-                    if not (r := resp.get("success")):
-                        print(f"missing triggers")
-                        return
-                    if (
-                        isinstance(r, dict)
-                        and "data" in r.keys()
-                        and r["data"]
-                        and r["success"]
-                    ):
-                        for id in r["data"]:
-                            if id not in past_triggers:
-                                past_triggers[id] = r["data"][id]
-                            else:
-                                past_triggers[id] += r["data"][id]
-
-                    break
-                except Exception as e:
-                    print(f"exception {e.__repr__(), e} in {endpoint}")
-                    if x == 3:
-                        return
-        return past_triggers
+        """Rate triggers in [from_time, to_time] ms, by default the last hour."""
+        from_time, to_time = self._time_range(from_time, to_time, 3600 * 1000)
+        endpoint = self._urls["v3_token-rate-trigger"]
+        past_triggers: defaultdict[str, list] = defaultdict(list)
+        params_list = [
+            {"fromTime": start, "toTime": end}
+            for start, end in self._time_windows(from_time, to_time, 86400000)
+        ]
+        lgr.debug("Getting triggers from: %d to: %d", from_time, to_time)
+        responses = self._map_windows(
+            lambda params: self.requestGET(endpoint, params=params), params_list
+        )
+        for resp in responses:
+            if not (r := resp.get("success")):
+                lgr.warning("Missing triggers, with: %s", resp.get("failed"))
+                return
+            if isinstance(r, dict) and "data" in r and r["data"] and r["success"]:
+                for id, triggers in r["data"].items():
+                    past_triggers[id].extend(triggers)
+        return dict(past_triggers)
 
     def get_trade_history_new(
-        self, from_time=ts_millis() - 86400 * 1000, to_time=ts_millis()
+        self, from_time: int | None = None, to_time: int | None = None
     ) -> list[dict[str, Any]]:
-        endpoint = self.endpoints["v3_tradehistory"].full_path()
+        """Trades in [from_time, to_time] ms, by default the last day."""
+        from_time, to_time = self._time_range(from_time, to_time)
+        endpoint = self._urls["v3_tradehistory"]
         past_trades = []
-        while from_time < to_time:
-            params = {
-                "fromTime": from_time,
-                "toTime": min(from_time + 86399999, to_time),
-            }
-            from_time += 86400000
-            x = 0
-            while x < 3:
-                x += 1
+        params_list = [
+            {"fromTime": start, "toTime": end}
+            for start, end in self._time_windows(from_time, to_time, 86400000)
+        ]
+        responses = self._map_windows(
+            lambda params: self.requestGET(endpoint, params=params), params_list
+        )
+        for resp in responses:
+            if not (r := resp.get("success")):
+                lgr.warning("Missing trades, with: %s", resp.get("failed"))
+                return past_trades
+            if (
+                isinstance(r, dict)
+                and (data := r.get("data"))
+                and (by_exchange := data.get("data"))
+            ):
+                pair_id = None
                 try:
-                    resp = self.requestGET(endpoint, params=params)
-                    if not (r := resp.get("success")):
-                        print(f"missing trades")
-                        return past_trades
-                    if (
-                        isinstance(r, dict)
-                        and "data" in r.keys()
-                        and r["data"]
-                        and ("data" in r["data"])
-                        and r["data"]["data"]
-                    ):
-                        for e in r["data"]["data"]:
-                            if bool(r["data"]["data"][e]):
-                                for pair_id in r["data"]["data"][e]:
-                                    for trade in r["data"]["data"][e][pair_id]:
-                                        trade["pair_id"] = int(pair_id)
-                                        # print(int(e),int(pair_id))
-                                        trade["pair"] = self.exchanges[int(e)][
-                                            int(pair_id)
-                                        ][2]
-                                        trade["pair"] = trade["pair"].replace(
-                                            f"-{int(e)}", ""
-                                        )
-                                        trade["exchange_id"] = int(e)
-                                        past_trades.append(trade)
-                    break
+                    for e, pairs in by_exchange.items():
+                        if not pairs:
+                            continue
+                        exchange_id = int(e)
+                        exchange = self.exchanges[exchange_id]
+                        for pair_id, trades in pairs.items():
+                            pid = int(pair_id)
+                            pair = exchange[pid][2].replace(f"-{exchange_id}", "")
+                            for trade in trades:
+                                trade["pair_id"] = pid
+                                trade["pair"] = pair
+                                trade["exchange_id"] = exchange_id
+                            past_trades.extend(trades)
                 except Exception as e:
-                    print(trade, pair_id, e)
-                    print(f"exception {e.__repr__(), e} in trade_history_3")
-                    if x == 3:
-                        return past_trades
+                    lgr.error("Cannot parse trades of pair %s: %r", pair_id, e)
+                    return past_trades
         return past_trades
 
     def get_open_orders(self) -> dict[str, Any]:
-        endpoint = self.endpoints["v3_open-orders"].full_path()
-        params = None
-        x = 0
-        while x < 3:
-            x += 1
-            try:
-                resp = self.requestGET(endpoint, params=params)
-                if not (r := resp.get("success")):
-                    print(f"missing open orders")
-                    return {"failed": "missing open orders"}
-                # print(r)
-                if isinstance(r, dict) and "success" in r and r["success"]:
-                    return r
-                break
-            except Exception as e:
-                print(f"exception {e.__repr__(), e} in open_orders")
-                if x == 3:
-                    return {"failed": e.__repr__()}
+        endpoint = self._urls["v3_open-orders"]
+        resp = self.requestGET(endpoint)
+        if not (r := resp.get("success")):
+            lgr.warning("Missing open orders, with: %s", resp.get("failed"))
+            return {"failed": "missing open orders"}
+        if isinstance(r, dict) and "success" in r and r["success"]:
+            return r
         return {"failed": "unknown error"}
 
-    def get_price_from_0x_levels(
-        self, zerox_levels: dict, token_in: str, token_out: str, amount_in: float
-    ) -> float:
+    def _levels_array(
+        self, zerox_levels: dict, token_in: str, token_out: str
+    ) -> tuple[np.ndarray, int]:
         token_in_addr = self.tokens_addr[token_in].lower()
-        token_in_decimals = self.tokens_decimals[token_in]
         token_out_addr = self.tokens_addr[token_out].lower()
         price = zerox_levels[f"{token_in_addr}_{token_out_addr}"]
-        total_in_amount = 0
-        total_out_amount = 0
-        for level in price:
-            in_amount = level[0] / 10**token_in_decimals
-            total_out_amount += (in_amount - total_in_amount) * level[1] / 10**18
-            total_in_amount = in_amount
-            if total_in_amount > amount_in:
-                excess_in_amount = total_in_amount - amount_in
-                excess_out_amount = excess_in_amount * level[1] / 10**18
-                total_out_amount -= excess_out_amount
-                break
-        if total_in_amount < amount_in:
-            return 0
-        return total_out_amount / amount_in if amount_in > 0 else 0
+        levels = np.asarray(price, dtype=np.float64).reshape(-1, 2)
+        return levels, self.tokens_decimals[token_in]
 
-    def _requestGET_retry(
-        self, endpoint: str, params: dict, results: list, retries: int = 3
-    ):
-        """Retry requestGET in case of exception"""
-        x = 0
-        while x < retries:
-            x += 1
-            try:
-                resp = self.requestGET(endpoint, params=params)
-                if not (r := resp.get("success")):
-                    print(f"Cannot get: {endpoint}")
-                    return
-                if isinstance(r, dict) and "data" in r.keys() and r["data"]:
-                    results += r["data"]
-                break
-            except Exception as e:
-                print(f"exception {e.__repr__(), e} in {endpoint}")
-                if x == retries:
-                    return
+    def get_price_from_0x_levels(
+        self, zerox_levels: dict, token_in: str, token_out: str, amount_in: float
+    ) -> float:
+        levels, decimals = self._levels_array(zerox_levels, token_in, token_out)
+        return float(_walk_levels(levels, decimals, np.array([amount_in]))[0])
+
+    def get_prices_from_0x_levels(
+        self,
+        zerox_levels: dict,
+        token_in: str,
+        token_out: str,
+        amounts_in: list[float],
+    ) -> list[float]:
+        """Price many `amounts_in` against the same levels in one vectorized pass."""
+        levels, decimals = self._levels_array(zerox_levels, token_in, token_out)
+        return _walk_levels(levels, decimals, np.asarray(amounts_in, float)).tolist()
+
+    @staticmethod
+    def _time_range(
+        from_time: int | None, to_time: int | None, span: int = 86_400_000
+    ) -> tuple[int, int]:
+        """Fill in a missing range end with now, and start with `span` ms before."""
+        if to_time is None:
+            to_time = ts_millis()
+        if from_time is None:
+            from_time = to_time - span
+        return from_time, to_time
+
+    @staticmethod
+    def _time_windows(from_time: int, to_time: int, step: int) -> list[tuple[int, int]]:
+        """Split [from_time, to_time] in consecutive windows of `step` ms."""
+        return [
+            (start, min(start + step - 1, to_time))
+            for start in range(from_time, to_time, step)
+        ]
+
+    def _map_windows(self, fetch: Callable[[Any], Any], windows: list) -> list:
+        """Run `fetch` for each of `windows` concurrently, sharing the client's
+        connection pool. Results keep the order of `windows`."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(fetch, windows))
+
+    def _get_windows_data(self, endpoint: str, params_list: list) -> list:
+        """Get the `data` of all windows concurrently, concatenated in order."""
+
+        def fetch(params: dict) -> list:
+            resp = self.requestGET(endpoint, params=params)
+            if not (r := resp.get("success")):
+                lgr.warning("Cannot get: %s, with: %s", endpoint, resp.get("failed"))
+                return []
+            return r.get("data") or [] if isinstance(r, dict) else []
+
+        return [d for data in self._map_windows(fetch, params_list) for d in data]
 
     def get_activities(
         self,
-        from_time=ts_millis() - 86400 * 1000,
-        to_time=ts_millis(),
+        from_time: int | None = None,
+        to_time: int | None = None,
         action="set_rates",
     ):
-        """Get activities from the reserve."""
-        endpoint = self.endpoints["v3_activities"].full_path()
-        list_activities = []
-        while from_time < to_time:
-            params = {
-                "actions": action,
-                "fromTime": from_time,
-                "toTime": min(from_time + 86399999, to_time),
-            }
-            from_time += 86400000
-            self._requestGET_retry(endpoint, params, list_activities)
-        return list_activities
+        """Get activities from the reserve, by default for the last day."""
+        from_time, to_time = self._time_range(from_time, to_time)
+        endpoint = self._urls["v3_activities"]
+        params_list = [
+            {"actions": action, "fromTime": start, "toTime": end}
+            for start, end in self._time_windows(from_time, to_time, 86400000)
+        ]
+        return self._get_windows_data(endpoint, params_list)
 
     def get_0x_quote_logs(
         self,
-        from_time=ts_millis() - 86400 * 1000,
-        to_time=ts_millis(),
+        from_time: int | None = None,
+        to_time: int | None = None,
         action="quote",
     ) -> list[dict[str, Any]]:
-        print(from_time, to_time, type(from_time), type(to_time))
+        from_time, to_time = self._time_range(from_time, to_time)
+        lgr.debug("Getting 0x quote logs from: %d to: %d", from_time, to_time)
         time_unit_to_split_requests_ms = 3600_000
-        endpoint = self.endpoints["0x_activity_logs"].full_path()
-        quote_logs = []
-        while from_time < to_time:
-            params = {
-                "type": action,
-                "fromTime": from_time,
-                "toTime": min(from_time + time_unit_to_split_requests_ms - 1, to_time),
-                # "cut":2
-            }
-            from_time += time_unit_to_split_requests_ms
-            self._requestGET_retry(endpoint, params, quote_logs)
-        return quote_logs
+        endpoint = self._urls["0x_activity_logs"]
+        windows = self._time_windows(from_time, to_time, time_unit_to_split_requests_ms)
+        params_list = [
+            {"type": action, "fromTime": start, "toTime": end} for start, end in windows
+        ]
+        return self._get_windows_data(endpoint, params_list)
 
     def get_quotes(
         self, from_time: int, to_time: int, cut: int = 2, verbose: bool = False
@@ -759,21 +912,14 @@ class ReserveClient:
             "toTime": to_time,
             "cut": cut,
         }
-        resp_with_stats = response_stats(self.requestGET)
-        resp = resp_with_stats(
-            self.endpoints["0x_activity_logs"].full_path(), params=params, timeout=120
-        )
+        request_get = response_stats(self.requestGET) if verbose else self.requestGET
+        resp = request_get(self._urls["0x_activity_logs"], params=params, timeout=120)
         rfqs = []
-        stats = (
-            {"fromTime": params["fromTime"], "toTime": params["toTime"]}
-            if verbose
-            else {}
-        )
-        if "success" in resp.keys():
+        if "success" in resp:
             reply = resp["success"]
             if verbose:
-                stats["success"] = True
-                print(resp["stats"] | stats)
+                resp["stats"].update(fromTime=from_time, toTime=to_time, success=True)
+                lgr.info("%s", resp["stats"])
             rfqs = sorted(reply["data"], key=lambda d: d["id"])
         else:
             # stats["success"] = False
@@ -790,7 +936,7 @@ class ReserveClient:
             start_dt: start date-time in format: "DD-MM-DD HH:MM:SS"
             end_dt: end date-time in format: "YYYY-MM-DD HH:MM:SS"
             tep: time step in hours or minutes or else
-            verbose: print progress
+            verbose: log progress, at INFO level
         Example:
             start_dt = "15/2/24 13:00:00.0+00:00"
             end_dt = "15/2/24 15:25:59.999+00:00"
@@ -803,32 +949,84 @@ class ReserveClient:
         almost_step = step - timedelta(seconds=0.001)
         rfqs = []
         _timer_start_run = timer()
-        for date in dates_gen(step, from_time, to_time):
-            _rfqs = self.get_quotes(dt_ts_milis(date), dt_ts_milis(date + almost_step))
+        dates = list(dates_gen(step, from_time, to_time))
+        windows = self._map_windows(
+            lambda date: self.get_quotes(
+                dt_ts_milis(date), dt_ts_milis(date + almost_step)
+            ),
+            dates,
+        )
+        for date, _rfqs in zip(dates, windows):
             rfqs += _rfqs
             if verbose:
-                print(f"{date}, rfqs number: {len(_rfqs)}")
+                lgr.info("%s, rfqs number: %d", date, len(_rfqs))
         if verbose:
             _timer_end_run = timer()
             # _dt_finished = datetime.now()
-            print(
-                f"Download took: {timedelta(seconds=_timer_end_run - _timer_start_run)}"
+            lgr.info(
+                "Download took: %s",
+                timedelta(seconds=_timer_end_run - _timer_start_run),
             )
             # print(f"Finished at: {_dt_finished}")
         return rfqs
 
+    async def aget_all_quotes(
+        self,
+        start_dt: str,
+        end_dt: str,
+        step: timedelta,
+        cut: int = 2,
+        max_concurrent: int = 32,
+    ) -> list[dict[str, Any]]:
+        """Async version of `get_all_quotes`. All `step` windows are requested
+        concurrently over a single aiohttp session, at most `max_concurrent` at a
+        time. Date-times are in the same format as in `get_all_quotes`."""
+        from_time = str_to_dtime(start_dt)
+        to_time = str_to_dtime(end_dt)
+        almost_step = step - timedelta(seconds=0.001)
+        url = self._host_urls[self._urls["0x_activity_logs"]]
+        windows = [
+            (dt_ts_milis(date), dt_ts_milis(date + almost_step))
+            for date in dates_gen(step, from_time, to_time)
+        ]
+        reqs = [
+            self._request_item(
+                url, {"type": "quote", "fromTime": f, "toTime": t, "cut": cut}, True
+            )
+            for f, t in windows
+        ]
+        responses = await fetch_all_urls(reqs, max_concurrent, timeout=120)
+        rfqs = []
+        for (f, t), resp in zip(windows, responses):
+            if "success" not in resp:
+                raise ValueError(
+                    f"Request failed for [{f}, {t}], with: {resp['failed']}"
+                )
+            rfqs += sorted(resp["success"]["data"], key=lambda d: d["id"])
+        return rfqs
+
     def blacklist_0x_get(self) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["0x_blacklist"].full_path())
+        return self.requestGET(self._urls["0x_blacklist"])
 
     def get_banned_addresses(self) -> list[str]:
-        """Get only banned addresses from the 0x blacklist data."""
+        """Get only banned addresses from the 0x blacklist data. Results are cached
+        for `banned_cache_ttl` seconds, use `invalidate_banned_cache` to refresh."""
+        cached = self._banned_cache
+        if cached and monotonic() - cached[0] < self.banned_cache_ttl:
+            return list(cached[1])
         try:
             banned = self.blacklist_0x_get()["success"]["data"]
         except KeyError as e:
             lgr.error(f"Cannot get banned addresses - KeyError: {e}")
             return []
-        banned_addr = [a["address"] for a in banned]
-        return [i.lower() for i in banned_addr]
+        banned_addr = [a["address"].lower() for a in banned]
+        # a tuple, callers get their own list and cannot change the cached one
+        self._banned_cache = (monotonic(), tuple(banned_addr))
+        return banned_addr
+
+    def invalidate_banned_cache(self) -> None:
+        """Drop the cached banned addresses, next call will fetch them again."""
+        self._banned_cache = None
 
     def blacklist_0x_set(
         self, list_of_addresses_and_desc: list, list_type="add"
@@ -838,21 +1036,25 @@ class ReserveClient:
         :param list_type: "add" adds, "remove" removes
         :return:
         """
-        if list_type not in ["add", "remove"]:
+        if list_type not in {"add", "remove"}:
             return {"failed": "list_type must be 'add' or 'remove'"}
-        endpoint = self.endpoints["0x_blacklist"].full_path()
+        endpoint = self._urls["0x_blacklist"]
         params: dict[str, list] = {}
-        params[list_type] = []
         if list_type == "add":
-            for add, desc in list_of_addresses_and_desc:
-                bl = {"address": add, "description": desc}
-                params[list_type].append(bl)
+            params[list_type] = [
+                {"address": add, "description": desc}
+                for add, desc in list_of_addresses_and_desc
+            ]
         else:
             params[list_type] = list_of_addresses_and_desc
-        return self.requestPOST(endpoint, json=params)
+        resp = self.requestPOST(endpoint, json=params)
+        # after the write, a lookup made while it was in flight may have cached the
+        # old list
+        self.invalidate_banned_cache()
+        return resp
 
     def whitelist_0x_get(self) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["0x_whitelist"].full_path())
+        return self.requestGET(self._urls["0x_whitelist"])
 
     def whitelist_0x_set(
         self, list_of_addresses_and_desc: list, list_type="add"
@@ -862,71 +1064,75 @@ class ReserveClient:
         :param list_type: "add" adds, "remove" removes
         :return:
         """
-        endpoint = self.endpoints["0x_whitelist"].full_path()
-        params: dict[str, list] = {}
-        params[list_type] = []
-        for add, desc in list_of_addresses_and_desc:
-            bl = {"address": add, "description": desc}
-            params[list_type].append(bl)
+        if list_type not in {"add", "remove"}:
+            return {"failed": "list_type must be 'add' or 'remove'"}
+        endpoint = self._urls["0x_whitelist"]
+        params: dict[str, list] = {
+            list_type: [
+                {"address": add, "description": desc}
+                for add, desc in list_of_addresses_and_desc
+            ]
+        }
         return self.requestPOST(endpoint, json=params)
 
     def get_feed_configuration(self) -> dict[str, Any]:
-        return self.requestGET(self.endpoints["v3_feed-configurations"].full_path())
+        return self.requestGET(self._urls["v3_feed-configurations"])
 
     def get_rates(
-        self, from_time=ts_millis() - 86400 * 1000, to_time=ts_millis()
+        self, from_time: int | None = None, to_time: int | None = None
     ) -> dict[str, Any]:
         activities = self.get_activities(from_time, to_time, "set_rates")
-        # print(activities)
-        result: dict[str, Any] = {}
+        result: defaultdict[str, list] = defaultdict(list)
         for actitvity in activities:
-            # print(actitvity)
             params = actitvity["params"]
             if actitvity["action"] == "set_rates":
-                is_mining_ok = (
-                    1 if actitvity["mining_status"].lower() != "failed" else 0
+                mining_ok = 1 if actitvity["mining_status"].lower() != "failed" else 0
+                timestamp = int(actitvity["timestamp"])
+                # convert all the wei amounts of the activity at once
+                buys = np.asarray(params["buys"], dtype=np.float64) / 1e18
+                buy_rates = np.divide(
+                    1.0, buys, out=np.zeros_like(buys), where=buys != 0
                 )
+                sells = np.asarray(params["sells"], dtype=np.float64) / 1e18
+                afp_mids = np.asarray(params["afpMid"], dtype=np.float64) / 1e18
                 rates = zip(
                     params["assets"],
-                    params["buys"],
-                    params["sells"],
-                    params["afpMid"],
+                    buy_rates.tolist(),
+                    sells.tolist(),
+                    afp_mids.tolist(),
                     params["triggers"],
                 )
-                timestamp = int(actitvity["timestamp"])
                 for token, buy, sell, afpMid, trigger in rates:
-                    if token not in result:
-                        result[token] = []
                     result[token].append(
                         {
-                            "buy": 1 / (buy / 10**18) if buy != 0 else 0,
-                            "sell": sell / 10**18,
-                            "afpmid": afpMid / 10**18,
+                            "buy": buy,
+                            "sell": sell,
+                            "afpmid": afpMid,
                             "timestamp": timestamp,
                             "trigger": 1 if trigger else 0,
-                            "mining_ok": 1 if is_mining_ok else 0,
+                            "mining_ok": mining_ok,
                         }
                     )
-        return result
+        return dict(result)
 
     def get_past_prices(
         self, symbols: list[str], from_ts: int, to_ts: int, interval: int | None = None
     ) -> dict[str, Any]:
         """Get historic prices for a symbol or multiple symbols. Prices are in USDT."""
-        params = {"symbols": ",".join(symbols), "from": from_ts, "to": to_ts}
+        params = {"symbols": _encode_csv(tuple(symbols)), "from": from_ts, "to": to_ts}
         if interval:
             params["interval"] = interval
         return self.requestGET(
-            self.endpoints["price-volatility_price"].full_path(),
+            self._urls["price-volatility_price"],
             params=params,
         )
 
     def get_volatility(self, pairs: list[str]) -> dict[str, Any]:
         """Get volatility for the given pairs. Returns fixed params volatility. For
         custom params use `get_custom_volatility`."""
-        params = {"pairs": ",".join(pairs)}
+        params = {"pairs": _encode_csv(tuple(pairs))}
         return self.requestGET(
-            self.endpoints["price-volatility_price-volatility"].full_path(),
+            self._urls["price-volatility_price-volatility"],
             params=params,
         )
 
@@ -977,7 +1183,7 @@ class ReserveClient:
             }
         """
         params = {
-            "pairs": ",".join(pairs),
+            "pairs": _encode_csv(tuple(pairs)),
             "sample_number": samples_size,
             "sample_interval_sec": sample_interval,
             "period_sec": target_period,
@@ -986,7 +1192,7 @@ class ReserveClient:
             "target_adjust": target_adjust,
         }
         return self.requestGET(
-            self.endpoints["price-volatility_custom-volatility"].full_path(),
+            self._urls["price-volatility_custom-volatility"],
             params=params,
         )
 
@@ -999,51 +1205,89 @@ class ReserveClient:
             pairs: list of pairs, eg. ["ETH-USDT", "BTC-USDT"]
         """
         # pairs must be in the format 1-7, where 1 is the base and 7 is the quote
-        _pairs = []
-        tokens = all_tokens if all_tokens else self.tokens
-        for pair in pairs:
-            base, quote = pair.split("-")
-            # get asset number
-            base = tokens[base]
-            quote = tokens[quote]
-            _pairs.append(f"{base}-{quote}")
-        params = {"pairs": ",".join(_pairs)}
+        tokens = all_tokens or self.tokens
+        # get asset numbers
+        _pairs = [
+            f"{tokens[base]}-{tokens[quote]}"
+            for base, quote in (pair.split("-") for pair in pairs)
+        ]
+        params = {"pairs": _encode_csv(tuple(_pairs))}
         lgr.debug(f"ReserveClient - multi_integration_volatility: pairs {params}")
         ep = "price-volatility_price-volatility_multiple-integration"
-        return self.requestGET(
-            self.endpoints[ep].full_path(),
-            params=params,
-        )
+        return self.requestGET(self._urls[ep], params=params)
+
+    def _m_t_m_request(
+        self, base: str, quote: str, timestamp_sec: int | None
+    ) -> tuple[str, dict[str, Any]]:
+        """Url and params of a mark-to-market rate request."""
+        params: dict[str, Any] = {
+            "base": _MTM_ALIASES.get(base, base),
+            "quote": _MTM_ALIASES.get(quote, quote),
+        }
+        if timestamp_sec is None:
+            return self._mtm_url, params
+        params["time"] = timestamp_sec
+        return self._mtm_hist_url, params
 
     def m_t_m(self, base: str, quote: str, timestamp_sec: int | None = None) -> float:
-        if base == "WETH":
-            base = "ETH"
-        if quote == "WETH":
-            quote = "ETH"
-        params: dict[str, Any] = dict(base=base, quote=quote)
-        if timestamp_sec is None:
-            url = self.endpoints["mark-to-market_rate"].full_url()
-        else:
-            params["time"] = timestamp_sec
-            url = self.endpoints["mark-to-market_historical/rate"].full_url()
+        url, params = self._m_t_m_request(base, quote, timestamp_sec)
+        base, quote = params["base"], params["quote"]
         resp_with_stats = response_stats(self.requestGET_url)
         resp = resp_with_stats(url, params, timeout=120)
-        reply = Response()
-        mtm = 0.0
-        if "success" in resp.keys():
-            reply = resp["success"]
-            stats = {"base": params["base"], "quote": params["quote"], "success": True}
-            print(resp["stats"] | stats)
-            try:
-                mtm = reply.json()["data"]["rate"]
-            except KeyError:
-                print(f"No rate for [{base}, {quote}], data: {reply.json()}")
-        else:
-            print(
-                f"Request failed for [{base}, {quote}], with: {resp['failed']}, "
-                f"stats: {resp['stats']}"
+        if "success" not in resp:
+            lgr.warning(
+                "Request failed for [%s, %s], with: %s, stats: %s",
+                base,
+                quote,
+                resp["failed"],
+                resp["stats"],
             )
-        return mtm
+            return 0.0
+        if lgr.isEnabledFor(logging.DEBUG):
+            resp["stats"].update(base=base, quote=quote, success=True)
+            lgr.debug("%s", resp["stats"])
+        body = orjson.loads(resp["success"].content)
+        try:
+            return body["data"]["rate"]
+        except KeyError:
+            lgr.warning("No rate for [%s, %s], data: %s", base, quote, body)
+            return 0.0
+
+    async def am_t_m_many(
+        self, pairs: list[tuple[str, str, int | None]], max_concurrent: int = 32
+    ) -> list[float]:
+        """Async batch of `m_t_m`. `pairs` are (base, quote, timestamp_sec) tuples,
+        requested concurrently over a single aiohttp session, at most
+        `max_concurrent` at a time.
+        Returns:
+            list: rates in the order of `pairs`, 0.0 where the rate is missing or
+            the request failed."""
+        url_params = [self._m_t_m_request(*pair) for pair in pairs]
+        reqs = [self._request_item(url, params, True) for url, params in url_params]
+        responses = await fetch_all_urls(reqs, max_concurrent, timeout=120)
+        rates = []
+        for (_, params), resp in zip(url_params, responses):
+            base, quote = params["base"], params["quote"]
+            if "success" not in resp:
+                lgr.warning(
+                    "Request failed for [%s, %s], with: %s", base, quote, resp["failed"]
+                )
+                rates.append(0.0)
+                continue
+            body = resp["success"]
+            try:
+                rates.append(body["data"]["rate"])
+            except (KeyError, TypeError):
+                lgr.warning("No rate for [%s, %s], data: %s", base, quote, body)
+                rates.append(0.0)
+        return rates
+
+    def m_t_m_many(
+        self, pairs: list[tuple[str, str, int | None]], max_concurrent: int = 32
+    ) -> list[float]:
+        """Blocking version of `am_t_m_many`. Cannot be called from a running event
+        loop, use the async version there."""
+        return asyncio.run(self.am_t_m_many(pairs, max_concurrent))
 
     def reserve_pnl_report(self, start_ts: int, end_ts: int) -> dict[str, Any]:
         """Get PnL report for the given time range
@@ -1054,12 +1298,12 @@ class ReserveClient:
             dict: success or failed, if success, the value in the the response object.
             The successful response object contains the pnl report in text format."""
         params = {"from": start_ts, "to": end_ts}
-        ep = self.endpoints["mmalert_reserve_pnl"]
+        ep = "mmalert_reserve_pnl"
         return self.requestGET_url(
-            ep.full_url(),
+            self._full_urls[ep],
             params=params,
             timeout=10,
-            secured=ep.secured,
+            secured=self._secured[ep],
         )
 
     def fusion_promotees(self, chain_id: int | None = None) -> list[dict[str, Any]]:
@@ -1067,18 +1311,17 @@ class ReserveClient:
         fusion promotees. If `chain_id` is provided, it returns the list of fusion
         promotees for the given chain."""
         params = {"chain_id": chain_id} if chain_id else {}
-        ep = self.endpoints["tradelogs-v2-promotees_promotees"]
+        ep = "tradelogs-v2-promotees_promotees"
         resp = self.requestGET_url(
-            ep.full_url(),
+            self._full_urls[ep],
             params=params,
             timeout=10,
-            secured=ep.secured,
+            secured=self._secured[ep],
         )
-        reply = Response()
-        if "success" in resp.keys():
+        if "success" in resp:
             reply = resp["success"]
             try:
-                return reply.json()["data"]
+                return orjson.loads(reply.content)["data"]
             except KeyError:
                 lgr.error(f"Cannot get fusion promotees, data: {reply.text}")
         else:
@@ -1091,10 +1334,56 @@ class ReserveClient:
         """Get general trade logs for the given time range.
         Timestamps are in milliseconds. There is a 24h limit for the time range."""
         params = {"from_time": from_ts, "to_time": to_ts}
-        ep = self.endpoints["tradelogs"]
+        ep = "tradelogs"
         return self.requestGET_url(
-            ep.full_url(),
+            self._full_urls[ep],
             params=params,
             timeout=timeout,
-            secured=ep.secured,
+            secured=self._secured[ep],
+        )
+
+    def _request_item(self, url: str, params: dict, secured: bool) -> RequestItem:
+        """Build an async `RequestItem`, signed with the client's credentials."""
+        return RequestItem(
+            "GET",
+            url,
+            params=params,
+            key_id=self.key_id if secured else None,
+            secret=self.secret if secured else None,
+        )
+
+    async def aget_general_tradelogs_range(
+        self, from_ts: int, to_ts: int, timeout: int = 30, max_concurrent: int = 4
+    ) -> dict[str, Any]:
+        """Get general trade logs for a time range of any length. The range is split
+        in `tradelogs_window_ms` windows which are fetched concurrently, at most
+        `max_concurrent` at a time. Timestamps are in milliseconds.
+        Returns:
+            dict: success with the `data` of all windows merged in time order, or
+            failed with the reason of the first failed window."""
+        ep = "tradelogs"
+        step = self.tradelogs_window_ms
+        reqs = [
+            self._request_item(
+                self._full_urls[ep],
+                {"from_time": t, "to_time": min(t + step - 1, to_ts)},
+                self._secured[ep],
+            )
+            for t in range(from_ts, to_ts, step)
+        ]
+        responses = await fetch_all_urls(reqs, max_concurrent, timeout)
+        data = []
+        for resp in responses:
+            if "success" not in resp:
+                return {"failed": resp["failed"]}
+            data += resp["success"].get("data") or []
+        return {"success": {"data": data}}
+
+    def get_general_tradelogs_range(
+        self, from_ts: int, to_ts: int, timeout: int = 30, max_concurrent: int = 4
+    ) -> dict[str, Any]:
+        """Blocking version of `aget_general_tradelogs_range`. Cannot be called from
+        a running event loop, use the async version there."""
+        return asyncio.run(
+            self.aget_general_tradelogs_range(from_ts, to_ts, timeout, max_concurrent)
         )
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import cached_property
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """
     https://github.com/ethereum/EIPs/blob/master/EIPS/eip-1559.md#specification
@@ -42,6 +43,11 @@ class Block:
     first transaction in the block (the one with the highest gas fee).
     """
 
+    # (indexed transactions list, its length, hash -> (position, Transaction)), built
+    # by `get_txn`. Not annotated, so it is a plain attribute and stays out of the
+    # dataclass fields.
+    _tx_index = (None, 0, {})
+
     baseFeePerGas: int
     difficulty: int
     extraData: str
@@ -60,13 +66,16 @@ class Block:
     def num_txs(self) -> int:
         return len(self.transactions)
 
-    @property
+    @cached_property
     def ts_date(self) -> str:
-        return datetime.utcfromtimestamp(self.timestamp).strftime("%d-%m-%Y %H:%M:%S")
+        dt = datetime.fromtimestamp(self.timestamp, tz=timezone.utc)
+        return dt.strftime("%d-%m-%Y %H:%M:%S")
 
     @property
     def ts_ago(self) -> str:
-        ago_td = datetime.utcnow() - datetime.utcfromtimestamp(self.timestamp)
+        ago_td = datetime.now(timezone.utc) - datetime.fromtimestamp(
+            self.timestamp, tz=timezone.utc
+        )
         # convert to days, hours, minutes
         days = ago_td.days
         hours, remainder = divmod(ago_td.seconds, 3600)
@@ -74,7 +83,15 @@ class Block:
         return f"{days}d {hours}h {minutes}m ago"
 
     def get_txn(self, hash: str) -> Transaction | None:
-        for txn in self.transactions:
-            if txn.hash == hash:
+        txs = self.transactions
+        indexed, n_txs, index = self._tx_index
+        # reuse the index while the list is the same and the hit is still in place
+        if indexed is txs and n_txs == len(txs) and (entry := index.get(hash)):
+            pos, txn = entry
+            if pos < n_txs and txs[pos] is txn:
                 return txn
-        return None
+        # first lookup, list replaced, resized or changed in place, or a miss
+        index = {txs[pos].hash: (pos, txs[pos]) for pos in range(len(txs) - 1, -1, -1)}
+        self._tx_index = txs, len(txs), index
+        entry = index.get(hash)
+        return entry[1] if entry else None
@@ -1,18 +1,35 @@
+import numpy as np
+
 QUOTE_CURRENCIES = ["DAI", "USDT", "BUSD", "USDC", "BTC", "WBTC", "WETH", "ETH"]
+QUOTE_CURRENCIES_IDX = {c: i for i, c in enumerate(QUOTE_CURRENCIES)}
 
 
 def decimals_by_token(token_name, token_list):
+    # the module token tables are constants and live as long as the module
+    if (by_name := _DECIMALS_BY_NAME.get(id(token_list))) is not None:
+        return by_name.get(token_name)
     for i in token_list:
         if i.name == token_name:
             return i.decimals
 
 
 class TokenItem:
+    __slots__ = (
+        "name",
+        "decimals",
+        "addresses",
+        "min_res",
+        "max_per_block",
+        "max_total",
+        "quote_rate",
+        "chain",
+    )
+
     def __init__(
         self,
         name,
         decimals,
-        addresses: list,
+        addresses: list[str],
         min_res,
         max_per_block,
         max_total,
@@ -21,7 +38,7 @@ class TokenItem:
     ):
         self.name = name
         self.decimals = decimals
-        self.addresses = addresses
+        self.addresses = tuple(a.lower() for a in addresses)
         self.min_res = min_res
         self.max_per_block = max_per_block
         self.max_total = max_total
@@ -30,6 +47,8 @@ class TokenItem:
 
 
 class rebalance_token(TokenItem):
+    __slots__ = ("token_imbalances", "quote_imbalances")
+
     def __init__(
         self, name, decimals, addresses: list, min_res, max_per_block, max_total
     ):
@@ -47,12 +66,39 @@ class rebalance_token(TokenItem):
         multiplier_base, multiplier_quote = -1, 1
         if buy:
             multiplier_base, multiplier_quote = 1, -1
-        if token_name in self.token_imbalances:
-            self.token_imbalances[token_name] += multiplier_base * amount_base
-            self.quote_imbalances[token_name] += multiplier_quote * amount_quote
-        else:
-            self.token_imbalances[token_name] = multiplier_base * amount_base
-            self.quote_imbalances[token_name] = multiplier_quote * amount_quote
+        base_delta = multiplier_base * amount_base
+        quote_delta = multiplier_quote * amount_quote
+        self.token_imbalances[token_name] = (
+            self.token_imbalances.get(token_name, 0) + base_delta
+        )
+        self.quote_imbalances[token_name] = (
+            self.quote_imbalances.get(token_name, 0) + quote_delta
+        )
+
+    def add_trades(
+        self,
+        token_names: list[str],
+        amounts_base: list[float],
+        amounts_quote: list[float],
+        buys: list[bool],
+    ):
+        """Batch version of `add_trade`, the imbalances of all trades are summed per
+        token in one NumPy pass before updating."""
+        names, idx = np.unique(np.asarray(token_names, dtype=str), return_inverse=True)
+        sign = np.where(np.asarray(buys, dtype=bool), 1.0, -1.0)
+        base = np.asarray(amounts_base, dtype=np.float64) * sign
+        quote = np.asarray(amounts_quote, dtype=np.float64) * -sign
+        base_sums = np.bincount(idx, weights=base, minlength=len(names))
+        quote_sums = np.bincount(idx, weights=quote, minlength=len(names))
+        for name, base_delta, quote_delta in zip(
+            names.tolist(), base_sums.tolist(), quote_sums.tolist()
+        ):
+            self.token_imbalances[name] = (
+                self.token_imbalances.get(name, 0) + base_delta
+            )
+            self.quote_imbalances[name] = (
+                self.quote_imbalances.get(name, 0) + quote_delta
+            )
 
     def reset_values(self):
         self.token_imbalances = {}  # imbalances of token amounts per token
@@ -62,7 +108,7 @@ class rebalance_token(TokenItem):
 bsc_test_btc = TokenItem(
     "BTC",
     8,
-    ["0xDe06c589cbdd69B96025413Fd82BfB2079fb790A".lower()],
+    ["0xDe06c589cbdd69B96025413Fd82BfB2079fb790A"],
     10,
     500000000,
     500000000,
@@ -73,7 +119,7 @@ bsc_test_btc = TokenItem(
 bsc_test_usdt = TokenItem(
     "USDT",
     6,
-    ["0xfCdCcd4cD29bd4B53274C8E900b00a6DB3460e08".lower()],
+    ["0xfCdCcd4cD29bd4B53274C8E900b00a6DB3460e08"],
     1000000000000000,
     50000000000000000000000,
     50000000000000000000000,
@@ -84,7 +130,7 @@ bsc_test_usdt = TokenItem(
 bsc_test_link = TokenItem(
     "LINK",
     18,
-    ["0xC7327B55218103194F69061c65Ad24D3d9DBFa51".lower()],
+    ["0xC7327B55218103194F69061c65Ad24D3d9DBFa51"],
     3000000000000000,
     10000000000000000000000,
     10000000000000000000000,
@@ -95,7 +141,7 @@ bsc_test_link = TokenItem(
 bsc_test_aave = TokenItem(
     "AAVE",
     18,
-    ["0x5466cBa4D2D2f8603EEd8433D20fe64870428Bf3".lower()],
+    ["0x5466cBa4D2D2f8603EEd8433D20fe64870428Bf3"],
     421000000000000000,
     1000000000000000000000,
     1000000000000000000000,
@@ -107,7 +153,7 @@ bsc_test_aave = TokenItem(
 bsc_test_1inch = TokenItem(
     "1INCH",
     18,
-    ["0x0AE0Ed81FA2c476f199061c51dd9e4f7860Df6FF".lower()],
+    ["0x0AE0Ed81FA2c476f199061c51dd9e4f7860Df6FF"],
     10000000000000000,
     20000000000000000000000,
     20000000000000000000000,
@@ -118,7 +164,7 @@ bsc_test_1inch = TokenItem(
 bsc_test_busd = TokenItem(
     "BUSD",
     18,
-    ["0x1486e4Ac531A6446cd5A5D61D16983f96a871100".lower()],
+    ["0x1486e4Ac531A6446cd5A5D61D16983f96a871100"],
     10000000000000000,
     200000000000000000000000,
     200000000000000000000000,
@@ -129,7 +175,7 @@ bsc_test_busd = TokenItem(
 bsc_test_usdc = TokenItem(
     "USDC",
     18,
-    ["0x1E33ce46Be97ee7a0E85D6F6e32d59E94BCf3E80".lower()],
+    ["0x1E33ce46Be97ee7a0E85D6F6e32d59E94BCf3E80"],
     10000000000000000,
     300000000000000000000000,
     300000000000000000000000,
@@ -140,7 +186,7 @@ bsc_test_usdc = TokenItem(
 bsc_test_bnb = TokenItem(
     "BNB",
     18,
-    ["0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee".lower()],
+    ["0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee"],
     10000000000000,
     2000000000000000000000,
     2000000000000000000000,
@@ -151,7 +197,7 @@ bsc_test_bnb = TokenItem(
 bsc_bnb = TokenItem(
     "BNB",
     18,
-    ["0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee".lower()],
+    ["0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee"],
     10000000000000,
     2000000000000000000000,
     2000000000000000000000,
@@ -162,7 +208,7 @@ bsc_bnb = TokenItem(
 bsc_usdt = TokenItem(
     "USDT",
     18,
-    ["0x55d398326f99059ff775485246999027b3197955".lower()],
+    ["0x55d398326f99059ff775485246999027b3197955"],
     1000000000000000,
     200000000000000000000000,
     200000000000000000000000,
@@ -173,7 +219,7 @@ bsc_usdt = TokenItem(
 bsc_busd = TokenItem(
     "BUSD",
     18,
-    ["0xe9e7cea3dedca5984780bafc599bd69add087d56".lower()],
+    ["0xe9e7cea3dedca5984780bafc599bd69add087d56"],
     1000000000000000,
     200000000000000000000000,
     200000000000000000000000,
@@ -184,7 +230,7 @@ bsc_busd = TokenItem(
 bsc_ltc = TokenItem(
     "LTC",
     18,
-    ["0x4338665CBB7B2485A8855A139b75D5e34AB0DB94".lower()],
+    ["0x4338665CBB7B2485A8855A139b75D5e34AB0DB94"],
     10000000000000,
     1000000000000000000000,
     1000000000000000000000,
@@ -195,7 +241,7 @@ bsc_ltc = TokenItem(
 bsc_xrp = TokenItem(
     "XRP",
     18,
-    ["0x1D2F0da169ceB9fC7B3144628dB156f3F6c60dBE".lower()],
+    ["0x1D2F0da169ceB9fC7B3144628dB156f3F6c60dBE"],
     10000000000000000,
     300000000000000000000000,
     300000000000000000000000,
@@ -207,7 +253,7 @@ bsc_xrp = TokenItem(
 bsc_btc = TokenItem(
     "BTC",
     18,
-    ["0x7130d2A12B9BCbFAe4f2634d864A1Ee1Ce3Ead9c".lower()],
+    ["0x7130d2A12B9BCbFAe4f2634d864A1Ee1Ce3Ead9c"],
     100000000000,
     1000000000000000000,
     1000000000000000000,
@@ -218,7 +264,7 @@ bsc_btc = TokenItem(
 bsc_eth = TokenItem(
     "ETH",
     18,
-    ["0x2170ed0880ac9a755fd29b2688956bd959f933f8".lower()],
+    ["0x2170ed0880ac9a755fd29b2688956bd959f933f8"],
     1000000000000,
     100000000000000000000,
     100000000000000000000,
@@ -672,7 +718,7 @@ btc = rebalance_token(
     100000000000000000000,
 )
 
-listed_tokens = [
+listed_tokens = (
     oneinch,
     aave,
     bat,
@@ -700,8 +746,8 @@ listed_tokens = [
     matic,
     ogn,
     c98,
-]
-new_listed_tokens = [
+)
+new_listed_tokens = (
     oneinch,
     aave,
     bat,
@@ -726,9 +772,9 @@ new_listed_tokens = [
     matic,
     ogn,
     c98,
-]
-tokens = [busd, dai, pax, usdc, usdt]
-kn_traded_full = [
+)
+tokens = (busd, dai, pax, usdc, usdt)
+kn_traded_full = (
     knc,
     omg,
     eos,
@@ -806,6 +852,18 @@ kn_traded_full = [
     ata,
     c98,
     weth,
-]
+)
+
+rebalance_tokens = (eth, usdt, btc, pax, usdc, busd, dai)
+
+# kn_traded_full by name and by lower case address, the first listed token wins
+TOKEN_BY_NAME: dict[str, TokenItem] = {t.name: t for t in reversed(kn_traded_full)}
+TOKEN_BY_ADDRESS: dict[str, TokenItem] = {
+    a: t for t in reversed(kn_traded_full) for a in reversed(t.addresses)
+}
 
-rebalance_tokens = [eth, usdt, btc, pax, usdc, busd, dai]
+# name -> decimals of the module token tables, the first listed token wins
+_DECIMALS_BY_NAME = {
+    id(token_list): {t.name: t.decimals for t in reversed(token_list)}
+    for token_list in (listed_tokens, new_listed_tokens, kn_traded_full)
+}
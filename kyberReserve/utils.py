@@ -1,11 +1,21 @@
-import json
+import logging
 import os
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from time import time
+from time import time_ns
 from typing import Iterator
 
-from kyberReserve.tokens import QUOTE_CURRENCIES
+import orjson
+
+from kyberReserve.tokens import QUOTE_CURRENCIES_IDX
+
+lgr = logging.getLogger(__name__)
+
+_CONVERT_CURRENCIES = {"WETH": "ETH", "WBTC": "BTC"}
+# quote importance by currency name, aliases ranked as the currency they stand for
+_QUOTE_IMPORTANCE = QUOTE_CURRENCIES_IDX | {
+    alias: QUOTE_CURRENCIES_IDX[c] for alias, c in _CONVERT_CURRENCIES.items()
+}
 
 
 class AuthContext(Enum):
@@ -14,8 +24,8 @@ class AuthContext(Enum):
     PROD_RW = 3
 
 
-def ts_millis():
-    return int(time() * 1000)
+def ts_millis() -> int:
+    return time_ns() // 1_000_000
 
 
 def dt_ts_milis(date: datetime) -> int:
@@ -46,54 +56,54 @@ def str_to_dtime(value: str) -> datetime:
 
 
 def load_json_file(key_file: str):
-    with open(key_file) as fh:
-        auth_data = json.load(fh)
-    return auth_data
+    with open(key_file, "rb") as fh:
+        return orjson.loads(fh.read())
+
+
+_CTX_CREDS = {
+    AuthContext.STAGING: ("test", "creds"),
+    AuthContext.PROD: ("prod", "creds"),
+    AuthContext.PROD_RW: ("prod", "creds_rw"),
+}
 
 
 class AuthenticationData:
     """ "Manage authentication data for Reserve API."""
 
+    __slots__ = ("_ctx", "api_key_0x")
+
     def __init__(self, key_file: str) -> None:
-        self.data = load_json_file(key_file)
+        data = load_json_file(key_file)
+        self.api_key_0x: str | None = data.get("0x-api-key")
+        # key material is static, resolve the contexts present in the file once
+        self._ctx: dict[AuthContext, tuple[str, str, bytes]] = {}
+        for ctx, (server, creds) in _CTX_CREDS.items():
+            try:
+                env = data[server]
+                key_id, secret = env[creds]["KEY_ID"], env[creds]["SECRET"]
+                self._ctx[ctx] = env["HOST"], key_id, secret.encode()
+            except KeyError:
+                continue
 
     def get_ctx(self, authContext: AuthContext) -> tuple[str, str, bytes]:
         """Get HOST, KEY_ID, SECRET based on context usage, production or test server.
         :param authContext: AuthContext.STAGING, AuthContext.PROD, AuthContext.PROD_RW
         """
-        is_testnet = True if authContext == AuthContext.STAGING else False
-        prod_rw = True if authContext == AuthContext.PROD_RW else False
-        host = self.data["test"]["HOST"] if is_testnet else self.data["prod"]["HOST"]
-        if is_testnet:
-            key_id = self.data["test"]["creds"]["KEY_ID"]
-            secret = self.data["test"]["creds"]["SECRET"]
-        else:
-            key_id = (
-                self.data["prod"]["creds_rw"]["KEY_ID"]
-                if prod_rw
-                else self.data["prod"]["creds"]["KEY_ID"]
-            )
-            secret = (
-                self.data["prod"]["creds_rw"]["SECRET"]
-                if prod_rw
-                else self.data["prod"]["creds"]["SECRET"]
-            )
-        return host, key_id, secret.encode()
-
-
-def convert_float_to_twei(input_num: float, token_decimals: int):
-    str_num = f"{input_num:.18f}"
-    try:
-        ind = str_num.index(".") + 1
-    except ValueError:
-        ind = len(str_num)
-
-    for _ in range(token_decimals):
-        str_num += "0"
-    if len(str_num[ind:]) > token_decimals:
-        str_num = str_num[:ind] + str_num[ind : ind + token_decimals]
-    str_num = str_num.replace(".", "")
-    return int(str_num)
+        return self._ctx[authContext]
+
+
+_POW10 = tuple(10**i for i in range(37))
+
+
+def convert_float_to_twei(input_num: float, token_decimals: int) -> int:
+    """Amount in token base units, truncated to `token_decimals` digits of the
+    18-decimal representation of `input_num`."""
+    wei = int(f"{input_num:.18f}".replace(".", ""))
+    if token_decimals >= 18:
+        return wei * _POW10[token_decimals - 18]
+    if wei < 0:
+        return -(-wei // _POW10[18 - token_decimals])
+    return wei // _POW10[18 - token_decimals]
 
 
 def convert_rate_to_binance(
@@ -101,64 +111,51 @@ def convert_rate_to_binance(
     out_amount: float,
     in_currency: str,
     out_currency: str,
-    quote_currencies=QUOTE_CURRENCIES,
+    quote_idx: dict[str, int] = _QUOTE_IMPORTANCE,
 ) -> tuple | None:
-    importance_in, importance_out = 100, 100
-    convert_currencies = {"WETH": "ETH", "WBTC": "BTC"}
-    if in_currency in convert_currencies:
-        in_currency = convert_currencies[in_currency]
-    if out_currency in convert_currencies:
-        out_currency = convert_currencies[out_currency]
-    if in_currency in quote_currencies:
-        importance_in = quote_currencies.index(in_currency)
-    if out_currency in quote_currencies:
-        importance_out = quote_currencies.index(out_currency)
+    importance_in = quote_idx.get(in_currency, 100)
+    importance_out = quote_idx.get(out_currency, 100)
     if importance_in == importance_out or in_amount <= 0 or out_amount <= 0:
-        print(
-            f"weird rate output for in:{in_amount} out:{out_amount}"
-            f" in_token:{in_currency} out_token:{out_currency}"
-        )
-        return None
-    if (
-        importance_in < importance_out
-    ):  # in_currency is the quote we buy with in to get out
-        # print(f"{out_currency}{in_currency} ASK {in_amount/out_amount}")
-        return (
-            f"{out_currency}{in_currency}",
-            "ASK",
-            in_amount / out_amount,
-            out_currency,
-            in_currency,
-        )
-    else:  # out currency is the quote se sell base for quote
-        # print(f"{in_currency}{out_currency} BID {out_amount / in_amount}")
-        return (
-            f"{in_currency}{out_currency}",
-            "BID",
-            out_amount / in_amount,
+        lgr.debug(
+            "weird rate output for in:%s out:%s in_token:%s out_token:%s",
+            in_amount,
+            out_amount,
             in_currency,
             out_currency,
         )
+        return None
+    in_currency = _CONVERT_CURRENCIES.get(in_currency, in_currency)
+    out_currency = _CONVERT_CURRENCIES.get(out_currency, out_currency)
+    # in_currency more important: it is the quote we buy out_currency with
+    if ask := importance_in < importance_out:
+        base, quote, rate = out_currency, in_currency, in_amount / out_amount
+    else:  # sell in_currency (base) for out_currency (quote)
+        base, quote, rate = in_currency, out_currency, out_amount / in_amount
+    return f"{base}{quote}", "ASK" if ask else "BID", rate, base, quote
 
 
 def saveEveryNth(results: list, filename: str, nRes: int) -> bool:
-    saved = False
-    if (n_res := len(results)) >= nRes:
-        if os.path.exists(filename):
-            try:
-                with open(filename, "r") as infile:
-                    res = json.load(infile)
-                    res += results
-            except json.decoder.JSONDecodeError as der:
-                print(f"Decoder error {der}")
-                res = results
-            with open(filename, "w") as outfile:
-                json.dump(res, outfile)
-            print(f"Saved {len(res)} results")
-            saved = True
-        else:
-            with open(filename, "w") as outfile:
-                json.dump(results, outfile)
-            print(f"Saved {n_res} results")
-            saved = True
-    return saved
+    """Append `results` to the JSON Lines file `filename`, one record per line, once
+    there are at least `nRes` of them. Returns True if the results were saved.
+
+    Files holding a single JSON array, as written by earlier versions, are not
+    compatible and raise ValueError instead of being appended to."""
+    if (n_res := len(results)) < nRes:
+        return False
+    with open(filename, "a+b") as outfile:
+        # every record written here ends with a newline, a JSON array does not
+        if outfile.tell():
+            outfile.seek(-1, os.SEEK_END)
+            if outfile.read(1) != b"\n":
+                raise ValueError(f"{filename} is not a JSON Lines file")
+        outfile.write(
+            b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in results)
+        )
+    lgr.info("Saved %d results", n_res)
+    return True
+
+
+def load_json_lines(filename: str) -> list:
+    """Load the records of a JSON Lines file written by `saveEveryNth`."""
+    with open(filename, "rb") as infile:
+        return [orjson.loads(line) for line in infile if line.strip()]
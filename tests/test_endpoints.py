@@ -0,0 +1,43 @@
+"""
+Tests for the EndpointItem class
+"""
+
+import unittest
+
+from kyberReserve.endpoints import EndpointItem
+
+
+class TestEndpointItem(unittest.TestCase):
+    def setUp(self):
+        self.item = EndpointItem(
+            path="activities",
+            base="v3",
+            sub_base="",
+            url="https://reserve.example.com",
+            methods=["GET"],
+            secured=True,
+            options={},
+            params={},
+            description="activities",
+        )
+
+    def test_full_path(self):
+        self.assertEqual(self.item.full_path(), "v3/activities")
+
+    def test_full_path_with_options(self):
+        # options are encoded sorted by key, whatever their order in the dict
+        options = {"toTime": 2, "fromTime": 1, "actions": ["a", "b"]}
+        self.assertEqual(
+            self.item.full_path(options),
+            "v3/activities?actions=a&actions=b&fromTime=1&toTime=2",
+        )
+
+    def test_full_url(self):
+        self.assertEqual(
+            self.item.full_url({"fromTime": 1}),
+            "https://reserve.example.com/v3/activities?fromTime=1",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,27 +2,94 @@
 Sample tests for the ReserveClient class
 """
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
+import orjson
+import requests
+
 from kyberReserve.reserveClient import ReserveClient
+from kyberReserve.utils import AuthContext
+
+HOST = "https://reserve.example.com"
+KEY_DATA = {
+    "test": {"HOST": HOST, "creds": {"KEY_ID": "key-id", "SECRET": "secret"}},
+    "prod": {"HOST": HOST, "creds": {"KEY_ID": "key-id", "SECRET": "secret"}},
+}
+ENDPOINTS_DATA = [
+    {
+        "base": "v3",
+        "endpoints": [
+            {"path": p, "methods": ["GET"], "description": p, "secured": True}
+            for p in ("asset", "authdata")
+        ],
+    },
+    {
+        "base": "0x",
+        "endpoints": [
+            {
+                "path": "blacklist",
+                "methods": ["GET", "POST"],
+                "description": "blacklist",
+                "secured": True,
+            }
+        ],
+    },
+]
+ASSETS = {
+    "success": True,
+    "data": [
+        {"id": 1, "symbol": "ETH", "address": "0xeth", "decimals": 18},
+        {"id": 2, "symbol": "USDT", "address": "0xusdt", "decimals": 6},
+    ],
+}
+# 0x levels of [cumulative in amount, price], raw units: 1 USDT at 2, 2 more at 1.5
+LEVELS = {"0xusdt_0xeth": [[1e6, 2e18], [3e6, 1.5e18]], "0xeth_0xusdt": []}
+
+
+def mock_response(status_code: int, content: bytes = b"", text: str = ""):
+    response = unittest.mock.Mock()
+    response.status_code = status_code
+    response.content = content
+    response.text = text
+    return response
 
 
 class TestReserveClient(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        # Set up the ReserveClient instance for testing
-        cls.client = ReserveClient(
-            key_file="path/to/key_file.json",
-            authContext="auth_context",
-            endpoints_json="path/to/endpoints.json",
-            timeout=60,
-        )
+        # Key and endpoints files are written once for the whole class
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        key_file = os.path.join(cls.tmp_dir.name, "key_file.json")
+        endpoints_json = os.path.join(cls.tmp_dir.name, "endpoints.json")
+        with open(key_file, "wb") as fh:
+            fh.write(orjson.dumps(KEY_DATA))
+        with open(endpoints_json, "wb") as fh:
+            fh.write(orjson.dumps(ENDPOINTS_DATA))
+
+        # Set up the ReserveClient instance for testing, the asset info it loads
+        # on init is served by the mocked session and not cached on disk
+        with patch.object(ReserveClient, "asset_cache_ttl", 0), patch.object(
+            requests.Session,
+            "send",
+            return_value=mock_response(200, orjson.dumps(ASSETS)),
+        ):
+            cls.client = ReserveClient(
+                key_file=key_file,
+                authContext=AuthContext.STAGING,
+                endpoints_json=endpoints_json,
+                timeout=60,
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.tmp_dir.cleanup()
 
     def test_sign(self):
-        # Mock the PreparedRequest object
-        request = unittest.mock.Mock()
-        request.headers = {}
+        request = requests.Request("GET", f"{HOST}/v3/authdata").prepare()
 
         # Call the sign method
         signed_request = self.client.sign(request)
@@ -30,15 +97,62 @@ class TestReserveClient(unittest.TestCase):
         # Assert that the Signature header is added to the request
         self.assertIn("Signature", signed_request.headers)
 
-    @patch("reserveClient.requests.sessions.Session.send")
-    def test_request_success(self, mock_send):
-        # Mock the response object
-        response = unittest.mock.Mock()
-        response.status_code = 200
-        response.json.return_value = {"success": {"data": "example"}}
+    @patch("kyberReserve.reserveClient.ts_millis", return_value=1698960526459)
+    def test_signed_get_matches_sign(self, _):
+        params = {"fromTime": 1, "toTime": 2}
+        for url in (f"{HOST}/v3/authdata", f"{HOST}/v3/authdata?cut=2"):
+            with self.subTest(url=url), patch.object(
+                requests.Session, "send", return_value=mock_response(200, b"{}")
+            ) as mock_send:
+                self.client.requestGET_url(url, params=params, timeout=60)
+                sent = mock_send.call_args.args[0]
+
+                # The direct GET signing must match signing the prepared request
+                request = requests.Request("GET", url, params=params)
+                expected = self.client.sign(request.prepare())
+                self.assertEqual(sent.url, expected.url)
+                self.assertEqual(
+                    sent.headers["Signature"], expected.headers["Signature"]
+                )
+
+    def test_price_from_0x_levels(self):
+        cases = [
+            (0.5, 2.0),  # inside the first level
+            (1.0, 2.0),  # exact fill of the first level
+            (2.0, 1.75),  # partly into the second level
+            (3.0, 5.0 / 3),  # exact fill of the whole book
+            (4.0, 0.0),  # more than the book can fill
+            (0.0, 0.0),
+            (-1.0, 0.0),
+        ]
+        for amount_in, price in cases:
+            with self.subTest(amount_in=amount_in):
+                self.assertAlmostEqual(
+                    self.client.get_price_from_0x_levels(
+                        LEVELS, "USDT", "ETH", amount_in
+                    ),
+                    price,
+                )
+
+    def test_prices_from_0x_levels(self):
+        amounts_in = [0.5, 1.0, 2.0, 3.0, 4.0, 0.0, -1.0]
+        prices = self.client.get_prices_from_0x_levels(
+            LEVELS, "USDT", "ETH", amounts_in
+        )
+        expected = [2.0, 2.0, 1.75, 5.0 / 3, 0.0, 0.0, 0.0]
+        self.assertEqual(len(prices), len(expected))
+        for price, expected_price in zip(prices, expected):
+            self.assertAlmostEqual(price, expected_price)
+        # an empty book cannot fill any amount
+        self.assertEqual(
+            self.client.get_prices_from_0x_levels(LEVELS, "ETH", "USDT", [1.0, 2.0]),
+            [0.0, 0.0],
+        )
 
+    @patch.object(requests.Session, "send")
+    def test_request_success(self, mock_send):
         # Configure the mock_send to return the mocked response
-        mock_send.return_value = response
+        mock_send.return_value = mock_response(200, b'{"data": "example"}')
 
         # Call the request method
         result = self.client.request("GET", "example_endpoint")
@@ -46,15 +160,10 @@ class TestReserveClient(unittest.TestCase):
         # Assert that the result is as expected
         self.assertEqual(result, {"success": {"data": "example"}})
 
-    @patch("reserveClient.requests.sessions.Session.send")
+    @patch.object(requests.Session, "send")
     def test_request_failure(self, mock_send):
-        # Mock the response object
-        response = unittest.mock.Mock()
-        response.status_code = 400
-        response.text = "Bad request"
-
         # Configure the mock_send to return the mocked response
-        mock_send.return_value = response
+        mock_send.return_value = mock_response(400, text="Bad request")
 
         # Call the request method
         result = self.client.request("GET", "example_endpoint")
@@ -63,18 +172,52 @@ class TestReserveClient(unittest.TestCase):
         self.assertEqual(
             result,
             {
-                "failed": "bad http status 400 reply:Bad request for request to example_endpoint, params:None, data: None, json: None"
+                "failed": " bad http status 400 reply:Bad request for request to example_endpoint, params:None, data: None, json: None"
             },
         )
 
+    def test_only_get_is_retried(self):
+        retry = self.client._session.get_adapter(HOST).max_retries
+        self.assertTrue(retry.is_retry("GET", 503))
+        # a write may have been applied before the error, it is not resent
+        self.assertFalse(retry.is_retry("POST", 500))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+    def test_banned_addresses_cache(self):
+        self.client.invalidate_banned_cache()
+        reply = {"success": {"data": [{"address": "0xAB"}]}}
+        with patch.object(
+            self.client, "blacklist_0x_get", return_value=reply
+        ) as mock_get:
+            banned = self.client.get_banned_addresses()
+            # changing a returned list must not change the cached addresses
+            banned.append("0xcd")
+            self.assertEqual(self.client.get_banned_addresses(), ["0xab"])
+            self.assertEqual(mock_get.call_count, 1)
+
+    def test_blacklist_set_invalidates_after_post(self):
+        self.client.invalidate_banned_cache()
+        old = {"success": {"data": [{"address": "0xab"}]}}
+        new = {"success": {"data": [{"address": "0xab"}, {"address": "0xcd"}]}}
+
+        def post(endpoint, json=None):
+            # a lookup while the write is in flight still sees the old list
+            self.assertEqual(self.client.get_banned_addresses(), ["0xab"])
+            return {"success": {"success": True}}
+
+        with patch.object(
+            self.client, "blacklist_0x_get", side_effect=[old, new]
+        ), patch.object(self.client, "requestPOST", side_effect=post):
+            self.client.blacklist_0x_set([["0xcd", "test"]])
+            self.assertEqual(self.client.get_banned_addresses(), ["0xab", "0xcd"])
+
     def test_get_authdata(self):
         # Mock the requestGET method
-        self.client.requestGET = unittest.mock.Mock(
-            return_value={"success": {"data": "example"}}
-        )
-
-        # Call the get_authdata method
-        result = self.client.get_authdata()
+        with patch.object(
+            self.client, "requestGET", return_value={"success": {"data": "example"}}
+        ):
+            # Call the get_authdata method
+            result = self.client.get_authdata()
 
         # Assert that the result is as expected
         self.assertEqual(result, {"success": {"data": "example"}})
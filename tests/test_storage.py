@@ -0,0 +1,101 @@
+"""
+Tests for the Block and Transaction storage classes
+"""
+
+import unittest
+from dataclasses import asdict, fields
+
+from kyberReserve.storage import Block, Transaction
+
+
+def make_txn(hash: str, idx: int) -> Transaction:
+    return Transaction(
+        blockNumber=1,
+        hash=hash,
+        nonce=idx,
+        blockHash="0xblock",
+        transactionIndex=idx,
+        from_="0xfrom",
+        to="0xto",
+        value=0,
+        type_=2,
+        chainId=1,
+        gas_limit=21000,
+        gasPrice=1,
+        maxFeePerGas=2,
+        maxPriorityFeePerGas=1,
+    )
+
+
+def make_block(transactions: list[Transaction]) -> Block:
+    return Block(
+        baseFeePerGas=1,
+        difficulty=0,
+        extraData="0x",
+        gasLimit=30_000_000,
+        gasUsed=21000,
+        hash="0xblock",
+        miner="0xminer",
+        mixHash="0xmix",
+        nonce="0x0",
+        number=1,
+        timestamp=1_700_000_000,
+        totalDifficulty=0,
+        transactions=transactions,
+    )
+
+
+class TestBlock(unittest.TestCase):
+    def test_get_txn(self):
+        first, second = make_txn("0xa", 0), make_txn("0xb", 1)
+        block = make_block([first, second, make_txn("0xa", 2)])
+        self.assertIs(block.get_txn("0xb"), second)
+        # the first transaction with a hash wins
+        self.assertIs(block.get_txn("0xa"), first)
+        self.assertIsNone(block.get_txn("0xc"))
+        # transactions added after a lookup are found too
+        third = make_txn("0xc", 3)
+        block.transactions.append(third)
+        self.assertIs(block.get_txn("0xc"), third)
+        # and so are those of a replaced list, with the same number of items
+        fourth, fifth = make_txn("0xd", 0), make_txn("0xe", 1)
+        block.transactions = [fourth, fifth, make_txn("0xf", 2), make_txn("0xg", 3)]
+        self.assertIs(block.get_txn("0xd"), fourth)
+        self.assertIsNone(block.get_txn("0xa"))
+        # or of an item assigned in place
+        sixth = make_txn("0xh", 0)
+        block.transactions[0] = sixth
+        self.assertIs(block.get_txn("0xh"), sixth)
+        self.assertIsNone(block.get_txn("0xd"))
+        self.assertIs(block.get_txn("0xe"), fifth)
+
+    def test_ts_date(self):
+        block = make_block([])
+        self.assertEqual(block.ts_date, "14-11-2023 22:13:20")
+
+    def test_caches_are_not_fields(self):
+        block = make_block([make_txn("0xa", 0)])
+        block.get_txn("0xa")
+        block.ts_date
+        names = [
+            "baseFeePerGas",
+            "difficulty",
+            "extraData",
+            "gasLimit",
+            "gasUsed",
+            "hash",
+            "miner",
+            "mixHash",
+            "nonce",
+            "number",
+            "timestamp",
+            "totalDifficulty",
+            "transactions",
+        ]
+        self.assertEqual([f.name for f in fields(Block)], names)
+        self.assertEqual(list(asdict(block)), names)
+        self.assertEqual(len(asdict(block)["transactions"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
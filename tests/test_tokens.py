@@ -0,0 +1,51 @@
+"""
+Tests for the rebalance_token imbalances
+"""
+
+import unittest
+
+from kyberReserve.tokens import rebalance_token
+
+TRADES = [
+    ("KNC", 100.0, 0.25, True),
+    ("LINK", 3.5, 0.01, False),
+    ("KNC", 40.0, 0.1, False),
+    ("USDT", 1000.0, 0.5, True),
+    ("KNC", 7.25, 0.02, True),
+    ("LINK", 1.5, 0.004, True),
+]
+
+
+def make_token() -> rebalance_token:
+    return rebalance_token("ETH", 18, ["0xETH"], 1, 10, 100)
+
+
+class TestRebalanceToken(unittest.TestCase):
+    def assertImbalancesEqual(self, first: dict, second: dict):
+        self.assertEqual(first.keys(), second.keys())
+        for name in first:
+            self.assertAlmostEqual(first[name], second[name])
+
+    def test_add_trades_matches_add_trade(self):
+        one_by_one, batch = make_token(), make_token()
+        # start from existing imbalances for part of the tokens
+        for token in (one_by_one, batch):
+            token.add_trade("KNC", 10.0, 0.03, False)
+        for trade in TRADES:
+            one_by_one.add_trade(*trade)
+        batch.add_trades(*map(list, zip(*TRADES)))
+        self.assertImbalancesEqual(one_by_one.token_imbalances, batch.token_imbalances)
+        self.assertImbalancesEqual(one_by_one.quote_imbalances, batch.quote_imbalances)
+        self.assertAlmostEqual(batch.token_imbalances["KNC"], 57.25)
+        self.assertAlmostEqual(batch.quote_imbalances["KNC"], -0.14)
+
+    def test_add_trades_empty(self):
+        token = make_token()
+        token.add_trade("KNC", 1.0, 0.5, True)
+        token.add_trades([], [], [], [])
+        self.assertEqual(token.token_imbalances, {"KNC": 1.0})
+        self.assertEqual(token.quote_imbalances, {"KNC": -0.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
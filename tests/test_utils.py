@@ -0,0 +1,66 @@
+"""
+Tests for the utils helpers
+"""
+
+import os
+import tempfile
+import unittest
+
+from kyberReserve.utils import convert_float_to_twei, load_json_lines, saveEveryNth
+
+
+class TestConvertFloatToTwei(unittest.TestCase):
+    def test_truncates_to_token_decimals(self):
+        # 84.4422 is 84.442199999999999704 to 18 decimals
+        self.assertEqual(convert_float_to_twei(84.4422, 6), 84442199)
+        self.assertEqual(convert_float_to_twei(0.1, 18), 100000000000000006)
+        self.assertEqual(
+            convert_float_to_twei(12345678901.5, 18), 12345678901 * 10**18 + 5 * 10**17
+        )
+
+    def test_more_than_18_decimals(self):
+        self.assertEqual(convert_float_to_twei(1.5, 24), 15 * 10**23)
+        self.assertEqual(
+            convert_float_to_twei(123.456, 24), 123456000000000003070000000
+        )
+
+    def test_zero_decimals(self):
+        self.assertEqual(convert_float_to_twei(123.999, 0), 123)
+        self.assertEqual(convert_float_to_twei(0.0, 0), 0)
+
+    def test_negative_input(self):
+        # truncated towards zero, as the positive amounts
+        self.assertEqual(convert_float_to_twei(-2.5, 6), -2500000)
+        self.assertEqual(convert_float_to_twei(-84.4422, 6), -84442199)
+        self.assertEqual(convert_float_to_twei(-0.9, 0), 0)
+
+
+class TestSaveEveryNth(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp_dir.name, "results.jsonl")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_append_load(self):
+        self.assertFalse(saveEveryNth(["0xa"], self.filename, 2))
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertTrue(saveEveryNth(["0xa", "0xb"], self.filename, 2))
+        self.assertTrue(saveEveryNth([{"c": 1}, [2, 3]], self.filename, 1))
+        self.assertEqual(
+            load_json_lines(self.filename), ["0xa", "0xb", {"c": 1}, [2, 3]]
+        )
+
+    def test_refuses_json_array_file(self):
+        with open(self.filename, "w") as fh:
+            fh.write('["0xa", "0xb"]')
+        with self.assertRaises(ValueError):
+            saveEveryNth(["0xc"], self.filename, 1)
+        # the old file is left untouched
+        with open(self.filename) as fh:
+            self.assertEqual(fh.read(), '["0xa", "0xb"]')
+
+
+if __name__ == "__main__":
+    unittest.main()